@@ -0,0 +1,228 @@
+"""Admission control for the /tools routes.
+
+Runs as ASGI middleware on the event loop, before a request can take a slot in
+the sync threadpool:
+
+* token buckets per caller (all endpoints) and per (caller, endpoint); a
+  caller is the tool token plus the `x-caller-id` the Netlify proxy forwards
+  (the proxy sends one shared token for everyone), or the client IP,
+* a cap on requests doing upstream work concurrently, with a queue-wait
+  budget: a request that cannot start within the budget is shed,
+* shed or rate-limited requests get `429` + `Retry-After`, or the last good
+  response for the identical request when one is recent enough.
+
+Limits are per worker process.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (tokens per second, burst) per caller across all endpoints
+TOKEN_RATE = (5.0, 50)
+# (tokens per second, burst) per caller and endpoint
+DEFAULT_ENDPOINT_RATE = (2.0, 20)
+ENDPOINT_RATE: Dict[str, Tuple[float, int]] = {
+    "team_intelligence": (0.5, 5),
+    "youtube": (1.0, 10),
+}
+# Requests allowed into the threadpool at once, and how long one may wait for a slot
+MAX_IN_FLIGHT = 16
+QUEUE_BUDGET_SECONDS = 1.5
+# Last good responses kept for shedding, and how old one may be when served
+STALE_ENTRIES = 512
+STALE_MAX_AGE = 600
+MAX_BUCKETS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> float:
+        """Take one token; return 0 on success, else seconds until one is available."""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.burst
+
+
+class ConcurrencyLimiter:
+    """FIFO slot limiter for one event loop; release hands the slot to the next waiter."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over as we timed out or were cancelled; pass it on
+                self.release()
+            else:
+                fut.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+        finally:
+            try:
+                self._waiters.remove(fut)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(True)
+                return
+        self.active -= 1
+
+
+def _caller(scope) -> str:
+    """Rate-limit identity: tool token plus forwarded caller id, else the client IP."""
+    headers = dict(scope.get("headers") or [])
+    token = (headers.get(b"x-tool-token") or b"").decode("latin-1")
+    caller_id = (headers.get(b"x-caller-id") or b"").decode("latin-1")
+    if not caller_id:
+        client = scope.get("client")
+        caller_id = f"ip:{client[0]}" if client else "anonymous"
+    return f"{token}|{caller_id}"
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying admission control to POST /tools/* requests."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.limiter = ConcurrencyLimiter(MAX_IN_FLIGHT)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._stale: "OrderedDict[str, Tuple[float, int, List[Tuple[bytes, bytes]], bytes]]" = OrderedDict()
+
+    def _bucket(self, caller: str, endpoint: str, rate: Tuple[float, int]) -> TokenBucket:
+        key = (caller, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                # Idle (full) buckets carry no state worth keeping
+                for k in [k for k, b in self._buckets.items() if b.is_full()]:
+                    del self._buckets[k]
+            bucket = self._buckets[key] = TokenBucket(*rate)
+        return bucket
+
+    def _rate_limit(self, caller: str, endpoint: str) -> float:
+        wait = self._bucket(caller, "*", TOKEN_RATE).try_take()
+        if wait:
+            return wait
+        return self._bucket(caller, endpoint, ENDPOINT_RATE.get(endpoint, DEFAULT_ENDPOINT_RATE)).try_take()
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope.get("method") != "POST" or not path.startswith("/tools/"):
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the (small JSON) body so it can key the stale cache and be replayed
+        chunks = []
+        more = True
+        while more:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        caller = _caller(scope)
+        endpoint = path[len("/tools/"):]
+        stale_key = hashlib.sha256(caller.encode() + b"\0" + path.encode() + b"\0" + body).hexdigest()
+
+        wait = self._rate_limit(caller, endpoint)
+        if wait:
+            await self._reject(send, stale_key, wait, "Rate limit exceeded")
+            return
+
+        if not await self.limiter.acquire(QUEUE_BUDGET_SECONDS):
+            logger.warning("Shedding %s: no slot within %.1fs", path, QUEUE_BUDGET_SECONDS)
+            await self._reject(send, stale_key, QUEUE_BUDGET_SECONDS, "Server busy")
+            return
+
+        captured: dict = {"status": 0, "headers": [], "body": []}
+
+        async def capture(message) -> None:
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers") or [])
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay, capture)
+        finally:
+            self.limiter.release()
+        if captured["status"] == 200:
+            self._remember(stale_key, captured["headers"], b"".join(captured["body"]))
+
+    def _remember(self, key: str, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        self._stale[key] = (time.monotonic(), 200, headers, body)
+        self._stale.move_to_end(key)
+        while len(self._stale) > STALE_ENTRIES:
+            self._stale.popitem(last=False)
+
+    async def _reject(self, send, stale_key: str, retry_after: float, reason: str) -> None:
+        stale = self._stale.get(stale_key)
+        if stale is not None and time.monotonic() - stale[0] <= STALE_MAX_AGE:
+            _, status, headers, body = stale
+            headers = [h for h in headers if h[0].lower() != b"cache-control"]
+            headers += [(b"cache-control", b"no-cache"), (b"x-served-stale", b"1")]
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+        payload = json.dumps({"detail": reason}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
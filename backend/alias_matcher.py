@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+class AliasMatcher:
+    """Aho-Corasick automaton mapping many alias strings to labels.
+
+    Built once over the alias table; `labels_in(text)` then finds every alias in
+    a single pass over the text, whatever the number of aliases. Matching is
+    case-insensitive and only counts whole-word occurrences ("Rays" does not
+    match inside "X-rays" or "strays").
+    """
+
+    def __init__(self, aliases: Iterable[Tuple[str, Hashable]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (alias length, label) for every alias ending here
+        self._out: List[List[Tuple[int, Hashable]]] = [[]]
+        for alias, label in aliases:
+            self._add(alias.lower(), label)
+        self._build()
+
+    def _add(self, alias: str, label: Hashable) -> None:
+        state = 0
+        for ch in alias:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(alias), label))
+
+    def _build(self) -> None:
+        # Depth-1 states keep failure link 0 (the root)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def labels_in(self, text: str) -> Set[Hashable]:
+        text = text.lower()
+        found: Set[Hashable] = set()
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, label in self._out[state]:
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (i + 1 == n or not text[i + 1].isalnum()):
+                    found.add(label)
+        return found
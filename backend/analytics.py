@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Collection, List, Optional
+
+from game_table import GameTable
+from profiling import traced
+
+
+@dataclass
+class TeamResults:
+    """Final games of one team in start-time order, stored as parallel columns.
+
+    All computations below are whole-column passes (prefix sums, zips, slices)
+    rather than per-game Python objects, so a full season is a few microseconds
+    of work per metric. A tied final (suspended, called) is neither `won` nor
+    `lost`, matching mlb_service, which gives such games no result.
+    """
+    game_ts: List[int]
+    opponent_id: List[int]
+    is_home: List[int]
+    runs_for: List[int]
+    runs_against: List[int]
+    won: List[int]
+    lost: List[int]
+
+    def __len__(self) -> int:
+        return len(self.won)
+
+    def tail(self, n: int) -> "TeamResults":
+        return TeamResults(*(col[-n:] if n else [] for col in self._columns()))
+
+    def where(self, mask: List[int]) -> "TeamResults":
+        return TeamResults(*([v for v, m in zip(col, mask) if m] for col in self._columns()))
+
+    def decided(self) -> "TeamResults":
+        """Only the games that ended in a win or a loss."""
+        return self.where([w | l for w, l in zip(self.won, self.lost)])
+
+    def _columns(self):
+        return (self.game_ts, self.opponent_id, self.is_home, self.runs_for, self.runs_against, self.won, self.lost)
+
+
+def team_results(table: GameTable, team_id: int) -> TeamResults:
+    c = table.columns
+    rows = [r for r in table.team_rows(team_id) if c["final"][r]]
+    is_home = [1 if c["home_id"][r] == team_id else 0 for r in rows]
+    home_score = [c["home_score"][r] for r in rows]
+    away_score = [c["away_score"][r] for r in rows]
+    runs_for = [h if ih else a for h, a, ih in zip(home_score, away_score, is_home)]
+    runs_against = [a if ih else h for h, a, ih in zip(home_score, away_score, is_home)]
+    return TeamResults(
+        game_ts=[c["game_ts"][r] for r in rows],
+        opponent_id=[c["away_id"][r] if ih else c["home_id"][r] for r, ih in zip(rows, is_home)],
+        is_home=is_home,
+        runs_for=runs_for,
+        runs_against=runs_against,
+        won=[1 if f > a else 0 for f, a in zip(runs_for, runs_against)],
+        lost=[1 if f < a else 0 for f, a in zip(runs_for, runs_against)],
+    )
+
+
+def record(res: TeamResults) -> dict:
+    """W/L record and runs; ties count as games and runs but not in W/L or win%."""
+    games = len(res)
+    wins = sum(res.won)
+    losses = sum(res.lost)
+    decided = wins + losses
+    runs_for = sum(res.runs_for)
+    runs_against = sum(res.runs_against)
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "ties": games - decided,
+        "win_pct": round(wins / decided, 3) if decided else None,
+        "runs_for": runs_for,
+        "runs_against": runs_against,
+        "run_diff": runs_for - runs_against,
+    }
+
+
+def home_away_splits(res: TeamResults) -> dict:
+    return {
+        "home": record(res.where(res.is_home)),
+        "away": record(res.where([1 - h for h in res.is_home])),
+    }
+
+
+def rolling_win_pct(res: TeamResults, window: int) -> List[float]:
+    """Win% over each trailing `window` decided games, one value per full window.
+
+    With fewer than `window` games, a single value over all of them; none without games.
+    Ties are skipped.
+    """
+    res = res.decided()
+    n = len(res)
+    if n == 0:
+        return []
+    if n < window:
+        return [round(sum(res.won) / n, 3)]
+    cum = [0, *accumulate(res.won)]
+    return [round((cum[i] - cum[i - window]) / window, 3) for i in range(window, n + 1)]
+
+
+def cumulative_run_differential(res: TeamResults) -> List[int]:
+    return list(accumulate(f - a for f, a in zip(res.runs_for, res.runs_against)))
+
+
+def current_streak(res: TeamResults) -> Optional[str]:
+    """E.g. "W3" or "L1"; None before the first decided game. Ties neither extend nor break it."""
+    res = res.decided()
+    if not res.won:
+        return None
+    last = res.won[-1]
+    length = 0
+    for w in reversed(res.won):
+        if w != last:
+            break
+        length += 1
+    return f"{'W' if last else 'L'}{length}"
+
+
+def longest_streaks(res: TeamResults) -> dict:
+    """Longest winning and losing runs, skipping ties."""
+    res = res.decided()
+    best = {"W": 0, "L": 0}
+    run, prev = 0, None
+    for w in res.won:
+        run = run + 1 if w == prev else 1
+        prev = w
+        key = "W" if w else "L"
+        best[key] = max(best[key], run)
+    return best
+
+
+@traced
+def team_trends(
+    table: GameTable,
+    team_id: int,
+    opponent_id: Optional[int] = None,
+    last_n: int = 10,
+    window: int = 10,
+    sections: Optional[Collection[str]] = None,
+) -> dict:
+    """Season record, splits, recent form and streaks; head-to-head when `opponent_id` is set.
+
+    `sections` limits which keys are computed (default: all).
+    """
+    res = team_results(table, team_id)
+    builders = {
+        "record": lambda: record(res),
+        "splits": lambda: home_away_splits(res),
+        "recent": lambda: record(res.tail(last_n)),
+        "streak": lambda: current_streak(res),
+        "longest_streaks": lambda: longest_streaks(res),
+        "rolling_win_pct": lambda: rolling_win_pct(res, window)[-last_n:],
+        "run_diff_trend": lambda: cumulative_run_differential(res)[-last_n:],
+    }
+    out: dict = {"season": table.season}
+    for name, build in builders.items():
+        if sections is None or name in sections:
+            out[name] = build()
+    if opponent_id is not None and (sections is None or "head_to_head" in sections):
+        h2h = res.where([1 if o == opponent_id else 0 for o in res.opponent_id])
+        out["head_to_head"] = {
+            **record(h2h),
+            "splits": home_away_splits(h2h),
+            "streak": current_streak(h2h),
+        }
+    return out
@@ -0,0 +1,251 @@
+"""Latency and memory benchmark: whole-body vs streaming parse of statsapi payloads.
+
+Compares, per payload:
+  * full:   `json.loads` on the complete body, then walk the nested dicts,
+  * stream: `json_stream.iter_array_items` over 64 KiB chunks, compacting as it goes,
+and reports the median wall time and the tracemalloc peak of each.
+
+Scenarios: league season schedule -> GameTable, one team's 60-day schedule ->
+GameInfo list, next-game lookup with early stop, league `/teams/stats` ->
+per-group stat lines.
+
+Synthetic payloads shaped like statsapi responses are used by default; pass
+recorded ones to measure real data, e.g.
+
+    curl -o season.json "https://statsapi.mlb.com/api/v1/schedule?sportId=1&season=2024&gameType=R,F,D,L,W"
+    curl -o team.json "https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId=147&startDate=2024-06-01&endDate=2024-07-30"
+    curl -o stats.json "https://statsapi.mlb.com/api/v1/teams/stats?group=hitting&group=pitching&stats=season&season=2024&sportId=1"
+    python bench_parse.py --season season.json --team team.json --team-id 147 --stats stats.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, Optional
+
+from game_table import GameTable
+from json_stream import CHUNK_SIZE, iter_array_items, iter_text
+from mlb_service import _compact_game, _game_info, _next_game_from
+
+# The 30 MLB club ids
+TEAM_IDS = list(range(108, 122)) + list(range(133, 148)) + [158]
+
+
+def _side(team_id: int, score: Optional[int]) -> dict:
+    side = {
+        "leagueRecord": {"wins": random.randint(0, 100), "losses": random.randint(0, 100), "pct": ".500"},
+        "team": {"id": team_id, "name": f"Team {team_id}", "link": f"/api/v1/teams/{team_id}"},
+        "isWinner": False,
+        "splitSquad": False,
+        "seriesNumber": random.randint(1, 52),
+    }
+    if score is not None:
+        side["score"] = score
+    return side
+
+
+def _game(pk: int, when: datetime, home: int, away: int, final: bool) -> dict:
+    state = "Final" if final else "Preview"
+    return {
+        "gamePk": pk,
+        "gameGuid": f"{pk:08x}-0000-0000-0000-000000000000",
+        "link": f"/api/v1.1/game/{pk}/feed/live",
+        "gameType": "R",
+        "season": str(when.year),
+        "gameDate": when.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "officialDate": when.strftime("%Y-%m-%d"),
+        "status": {
+            "abstractGameState": state,
+            "codedGameState": state[0],
+            "detailedState": "Final" if final else "Scheduled",
+            "statusCode": state[0],
+            "startTimeTBD": False,
+            "abstractGameCode": state[0],
+        },
+        "teams": {
+            "away": _side(away, random.randint(0, 12) if final else None),
+            "home": _side(home, random.randint(0, 12) if final else None),
+        },
+        "venue": {"id": home, "name": f"Park {home}", "link": f"/api/v1/venues/{home}"},
+        "content": {"link": f"/api/v1/game/{pk}/content"},
+        "isTie": False,
+        "gameNumber": 1,
+        "publicFacing": True,
+        "doubleHeader": "N",
+        "gamedayType": "P",
+        "tiebreaker": "N",
+        "calendarEventID": f"14-{pk}-{when:%Y-%m-%d}",
+        "seasonDisplay": str(when.year),
+        "dayNight": "night",
+        "scheduledInnings": 9,
+        "reverseHomeAwayStatus": False,
+        "inningBreakLength": 120,
+        "gamesInSeries": 3,
+        "seriesGameNumber": 1,
+        "seriesDescription": "Regular Season",
+        "recordSource": "S",
+        "ifNecessary": "N",
+        "ifNecessaryDescription": "Normal Game",
+    }
+
+
+def synthetic_schedule(days: int, team_id: Optional[int] = None, final_days: int = 0) -> dict:
+    """statsapi-shaped `/schedule` payload: 15 games a day league-wide, or one for `team_id`."""
+    start = datetime(2024, 4, 1, 23, 5, tzinfo=timezone.utc)
+    dates = []
+    pk = 700000
+    for d in range(days):
+        when = start + timedelta(days=d)
+        teams = TEAM_IDS[:]
+        random.shuffle(teams)
+        if team_id is not None:
+            teams.remove(team_id)
+            teams = [team_id] + teams[:1]
+        games = []
+        for i in range(0, len(teams) - 1, 2):
+            pk += 1
+            games.append(_game(pk, when, teams[i], teams[i + 1], d < final_days))
+        dates.append({
+            "date": when.strftime("%Y-%m-%d"),
+            "totalItems": len(games),
+            "totalEvents": 0,
+            "totalGames": len(games),
+            "totalGamesInProgress": 0,
+            "games": games,
+            "events": [],
+        })
+    return {"copyright": "Copyright 2024 MLB Advanced Media, L.P.", "totalItems": 0, "wait": 10, "dates": dates}
+
+
+def synthetic_team_stats() -> dict:
+    stats = []
+    for group, n_fields in (("hitting", 40), ("pitching", 55)):
+        splits = [
+            {
+                "season": "2024",
+                "stat": {f"stat{i}": (str(random.random())[:5] if i % 3 else random.randint(0, 900)) for i in range(n_fields)},
+                "team": {"id": t, "name": f"Team {t}", "link": f"/api/v1/teams/{t}"},
+            }
+            for t in TEAM_IDS
+        ]
+        stats.append({
+            "type": {"displayName": "season"},
+            "group": {"displayName": group},
+            "exemptions": [],
+            "splits": splits,
+        })
+    return {"copyright": "Copyright 2024 MLB Advanced Media, L.P.", "stats": stats}
+
+
+def _encode(payload: dict) -> bytes:
+    # statsapi pretty-prints with `"key" : value`
+    return json.dumps(payload, indent=2).replace('": ', '" : ').encode("utf-8")
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    # Like Response.iter_content: one network chunk alive at a time
+    for i in range(0, len(body), CHUNK_SIZE):
+        yield body[i:i + CHUNK_SIZE]
+
+
+def measure(fn: Callable[[], object], runs: int) -> tuple[float, float]:
+    """(median ms, peak traced KiB) of `fn`."""
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024
+
+
+def _games_full(body: bytes):
+    payload = json.loads(b"".join(_chunks(body)))
+    return [g for d in (payload.get("dates") or []) for g in (d.get("games") or [])]
+
+
+def _games_stream(body: bytes):
+    return iter_array_items(iter_text(_chunks(body)), "games")
+
+
+def _team_stats_full(body: bytes) -> dict:
+    out: dict = {}
+    for block in json.loads(b"".join(_chunks(body))).get("stats") or []:
+        group = ((block.get("group") or {}).get("displayName") or "").lower()
+        for sp in block.get("splits") or []:
+            out.setdefault(group, {}).setdefault(str(sp["team"]["id"]), sp["stat"])
+    return out
+
+
+def _team_stats_stream(body: bytes) -> dict:
+    out: dict = {}
+    for block in iter_array_items(iter_text(_chunks(body)), "stats"):
+        group = ((block.get("group") or {}).get("displayName") or "").lower()
+        for sp in block.get("splits") or []:
+            out.setdefault(group, {}).setdefault(str(sp["team"]["id"]), sp["stat"])
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--season", help="Recorded league-wide season /schedule payload")
+    parser.add_argument("--team", help="Recorded single-team /schedule payload")
+    parser.add_argument("--team-id", type=int, default=147, help="Team of the --team payload")
+    parser.add_argument("--stats", help="Recorded /teams/stats payload")
+    args = parser.parse_args()
+    random.seed(7)
+
+    def load(path: Optional[str], make: Callable[[], dict]) -> bytes:
+        if path:
+            with open(path, "rb") as f:
+                return f.read()
+        return _encode(make())
+
+    team_id = args.team_id
+    season_body = load(args.season, lambda: synthetic_schedule(186))
+    team_body = load(args.team, lambda: synthetic_schedule(60, team_id=team_id, final_days=30))
+    stats_body = load(args.stats, synthetic_team_stats)
+    # Halfway through the 60-day window: the answer sits in the middle of the payload
+    from_dt = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+    def next_game(games) -> None:
+        rows = (_compact_game(g) for g in games)
+        _next_game_from((_game_info(r, team_id) for r in rows if r is not None), from_dt)
+
+    scenarios = [
+        ("season -> GameTable", season_body,
+         lambda: GameTable.from_games(2024, _games_full(season_body)),
+         lambda: GameTable.from_games(2024, _games_stream(season_body))),
+        ("team 60d -> GameInfo", team_body,
+         lambda: [_game_info(r, team_id) for r in map(_compact_game, _games_full(team_body)) if r],
+         lambda: [_game_info(r, team_id) for r in map(_compact_game, _games_stream(team_body)) if r]),
+        ("next game (early stop)", team_body,
+         lambda: next_game(_games_full(team_body)),
+         lambda: next_game(_games_stream(team_body))),
+        ("/teams/stats -> groups", stats_body,
+         lambda: _team_stats_full(stats_body),
+         lambda: _team_stats_stream(stats_body)),
+    ]
+
+    print(f"{'scenario':<24} {'payload':>9} {'full ms':>9} {'stream ms':>10} {'full peak':>10} {'stream peak':>12}")
+    for name, body, full, stream in scenarios:
+        full_ms, full_kib = measure(full, args.runs)
+        stream_ms, stream_kib = measure(stream, args.runs)
+        print(
+            f"{name:<24} {len(body) / 1024:>7.0f}KB {full_ms:>9.1f} {stream_ms:>10.1f} "
+            f"{full_kib:>8.0f}KB {stream_kib:>10.0f}KB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Startup-time benchmark for the backend app.
+
+Measures, in fresh interpreters:
+  * import time of `main` (what every cold worker pays before serving), and
+  * time from spawning uvicorn to the first successful `/health` response.
+
+Also checks that optional heavy dependencies are not imported at startup.
+
+    python bench_startup.py [--runs 5]
+
+Exits non-zero when a median exceeds its target, so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+# Targets tracked across releases (median over runs, milliseconds).
+# Measured `import main`: ~650 ms before lazy optional imports, ~600 ms after;
+# the target is the post-change median plus a small margin, so losing the gain fails.
+# `requests` (~50 ms) stays on the path: mlb_service and http_cache need it at import.
+IMPORT_TARGET_MS = 620
+FIRST_HEALTH_TARGET_MS = 1500
+
+LAZY_MODULES = ("newsapi", "youtube_transcript_api", "youtubesearchpython")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_IMPORT_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - t0) * 1000
+eager = [m for m in {lazy!r} if m in sys.modules]
+print(f"{{elapsed:.1f}} {{','.join(eager)}}")
+"""
+
+
+def measure_import() -> tuple[float, list[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET.format(lazy=LAZY_MODULES)],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(out[0]), (out[1].split(",") if len(out) > 1 else [])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_first_health(timeout: float = 30.0) -> float:
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        while time.perf_counter() - t0 < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - t0) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health did not respond within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    import_ms: list[float] = []
+    eager: set[str] = set()
+    health_ms: list[float] = []
+    for _ in range(args.runs):
+        ms, mods = measure_import()
+        import_ms.append(ms)
+        eager.update(mods)
+        health_ms.append(measure_first_health())
+
+    imp, health = statistics.median(import_ms), statistics.median(health_ms)
+    print(f"import main:        median {imp:7.1f} ms  (target {IMPORT_TARGET_MS} ms)")
+    print(f"first /health 200:  median {health:7.1f} ms  (target {FIRST_HEALTH_TARGET_MS} ms)")
+    if eager:
+        print(f"eagerly imported optional modules: {', '.join(sorted(eager))}")
+
+    ok = imp <= IMPORT_TARGET_MS and health <= FIRST_HEALTH_TARGET_MS and not eager
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,35 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
 from dotenv import load_dotenv
 
-load_dotenv()
+
+def _env(name: str, default: str | None = None):
+    return field(default_factory=lambda: os.getenv(name) or default)
+
 
 @dataclass
 class Settings:
     """Lightweight settings loader.
-    Reads from environment variables. python-dotenv will load a .env if called by the app.
+    Reads from environment variables when instantiated; use `get_settings()`,
+    which loads `.env` once per process before reading them.
     """
 
-    NEWS_API_KEY: str | None = os.getenv("NEWS_API_KEY")
-    YOUTUBE_API_KEY: str | None = os.getenv("YOUTUBE_API_KEY")
-    ELEVEN_AGENT_ID: str | None = os.getenv("ELEVEN_AGENT_ID")
-    TOOL_TOKEN: str | None = os.getenv("TOOL_TOKEN")
+    NEWS_API_KEY: str | None = _env("NEWS_API_KEY")
+    YOUTUBE_API_KEY: str | None = _env("YOUTUBE_API_KEY")
+    ELEVEN_AGENT_ID: str | None = _env("ELEVEN_AGENT_ID")
+    TOOL_TOKEN: str | None = _env("TOOL_TOKEN")
+    # SQLite file shared by all workers on this host (see shared_cache.py)
+    CACHE_PATH: str = _env("CACHE_PATH", os.path.join(tempfile.gettempdir(), "mlb_tools_cache.sqlite3"))
+    # Offline packs for completed seasons (see season_pack.py)
+    SEASON_PACK_DIR: str = _env("SEASON_PACK_DIR", os.path.join(os.path.dirname(__file__), "data", "season_packs"))
+    # Fraction of /tools requests to profile without being asked (see profiling.py)
+    PROFILE_SAMPLE_RATE: str | None = _env("PROFILE_SAMPLE_RATE")
+    # Comma-separated hosts that job completion callbacks may be sent to (see jobs.py)
+    JOB_CALLBACK_HOSTS: str | None = _env("JOB_CALLBACK_HOSTS")
 
     # Provide both UPPER and lower-case convenience attributes
     @property
@@ -27,4 +41,10 @@ class Settings:
         return self.YOUTUBE_API_KEY
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    load_dotenv()
+    return Settings()
+
+
+settings = get_settings()
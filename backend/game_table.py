@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import bisect
+from array import array
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# (name, typecode) of the per-game columns. Name/venue/status columns index
+# `GameTable.strings`; -1 marks a missing venue or score. `official_date` is
+# statsapi's local game date as YYYYMMDD, the date `/schedule` filters on.
+GAME_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("game_pk", "i"),
+    ("game_ts", "q"),
+    ("official_date", "i"),
+    ("home_id", "i"),
+    ("away_id", "i"),
+    ("home_name", "i"),
+    ("away_name", "i"),
+    ("venue", "i"),
+    ("status", "i"),
+    ("home_score", "i"),
+    ("away_score", "i"),
+    ("final", "b"),
+)
+
+# (game_pk, game_date, home_id, away_id, home_name, away_name, venue, status, home_score, away_score)
+GameRow = Tuple[int, datetime, int, int, str, str, Optional[str], str, Optional[int], Optional[int]]
+
+
+def _day_number(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _score(side: dict) -> int:
+    score = side.get("score")
+    return score if isinstance(score, int) else -1
+
+
+class GameTable:
+    """Compact per-season game table: one row per game, columns as typed arrays.
+
+    Rows are sorted by start time. Columns can be `array.array` objects or
+    memoryviews over a season pack, so the same code serves live and offline data.
+    """
+
+    def __init__(self, season: int, columns: Dict[str, Sequence[int]], strings: List[str]) -> None:
+        self.season = season
+        self.columns = columns
+        self.strings = strings
+        self._team_rows: Dict[int, List[int]] | None = None
+        self._team_ts: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["game_pk"])
+
+    @classmethod
+    def from_schedule(cls, season: int, payload: dict) -> "GameTable":
+        """Build a table from a raw statsapi `/schedule` payload."""
+        return cls.from_games(season, (g for d in (payload.get("dates") or []) for g in (d.get("games") or [])))
+
+    @classmethod
+    def from_games(cls, season: int, games: Iterable[dict]) -> "GameTable":
+        """Build a table from statsapi game objects, e.g. streamed one at a time (see json_stream)."""
+        strings: List[str] = []
+        string_idx: Dict[str, int] = {}
+
+        def intern(s: Optional[str]) -> int:
+            if s is None:
+                return -1
+            if s not in string_idx:
+                string_idx[s] = len(strings)
+                strings.append(s)
+            return string_idx[s]
+
+        rows = []
+        for g in games:
+            teams = g.get("teams") or {}
+            home_side = teams.get("home") or {}
+            away_side = teams.get("away") or {}
+            home = home_side.get("team") or {}
+            away = away_side.get("team") or {}
+            game_date = g.get("gameDate")
+            if not (g.get("gamePk") and game_date and home.get("id") and away.get("id")):
+                continue
+            status = g.get("status") or {}
+            home_score, away_score = _score(home_side), _score(away_side)
+            final = status.get("abstractGameState") == "Final" and home_score >= 0 and away_score >= 0
+            dt = datetime.fromisoformat(game_date.replace("Z", "+00:00"))
+            official = g.get("officialDate")
+            rows.append((
+                g["gamePk"],
+                int(dt.timestamp()),
+                int(official.replace("-", "")) if official else _day_number(dt.date()),
+                home["id"],
+                away["id"],
+                intern(home.get("name") or ""),
+                intern(away.get("name") or ""),
+                intern((g.get("venue") or {}).get("name")),
+                intern(status.get("detailedState") or status.get("abstractGameState") or ""),
+                home_score,
+                away_score,
+                1 if final else 0,
+            ))
+        rows.sort(key=lambda r: r[1])
+        columns = {
+            name: array(typecode, [r[i] for r in rows])
+            for i, (name, typecode) in enumerate(GAME_COLUMNS)
+        }
+        return cls(season, columns, strings)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly form, e.g. for the shared cache."""
+        return {
+            "season": self.season,
+            "strings": self.strings,
+            "columns": {name: list(self.columns[name]) for name, _ in GAME_COLUMNS},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameTable":
+        columns = {name: array(typecode, data["columns"][name]) for name, typecode in GAME_COLUMNS}
+        return cls(data["season"], columns, data["strings"])
+
+    def team_rows(self, team_id: int) -> List[int]:
+        """Row indices of the team's games, in start-time order."""
+        if self._team_rows is None:
+            index: Dict[int, List[int]] = {}
+            home, away = self.columns["home_id"], self.columns["away_id"]
+            for row in range(len(home)):
+                index.setdefault(home[row], []).append(row)
+                index.setdefault(away[row], []).append(row)
+            self._team_rows = index
+        return self._team_rows.get(team_id, [])
+
+    def _string(self, idx: int) -> Optional[str]:
+        return self.strings[idx] if idx >= 0 else None
+
+    def team_games(self, team_id: int, start: date, end: date) -> Iterator[GameRow]:
+        """Yield the team's games whose official date falls within [start, end], as `/schedule` does."""
+        rows = self.team_rows(team_id)
+        if not rows:
+            return
+        c = self.columns
+        ts = self._team_ts.get(team_id)
+        if ts is None:
+            ts = self._team_ts[team_id] = [c["game_ts"][r] for r in rows]
+        # The local official date is within a day of the UTC start date; bisect a
+        # window one day wider on each side, then filter on the official date
+        lo_ts = datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp() - 86400
+        hi_ts = datetime(end.year, end.month, end.day, 23, 59, 59, tzinfo=timezone.utc).timestamp() + 86400
+        lo_day, hi_day = _day_number(start), _day_number(end)
+        for i in range(bisect.bisect_left(ts, lo_ts), bisect.bisect_right(ts, hi_ts)):
+            r = rows[i]
+            if not lo_day <= c["official_date"][r] <= hi_day:
+                continue
+            home_score, away_score = c["home_score"][r], c["away_score"][r]
+            yield (
+                c["game_pk"][r],
+                datetime.fromtimestamp(c["game_ts"][r], tz=timezone.utc),
+                c["home_id"][r],
+                c["away_id"][r],
+                self.strings[c["home_name"][r]],
+                self.strings[c["away_name"][r]],
+                self._string(c["venue"][r]),
+                self.strings[c["status"][r]],
+                home_score if home_score >= 0 else None,
+                away_score if away_score >= 0 else None,
+            )
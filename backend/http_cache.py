@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Iterator
+
+import requests
+
+from json_stream import CHUNK_SIZE, iter_array_items, iter_text
+from profiling import span
+from shared_cache import get_shared_cache, make_key
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime (seconds) of the caller's cached copy, for callers that do not pass one
+DEFAULT_TTL = 30 * 60
+# Larger bodies are not kept for revalidation: they are big league-wide payloads
+# whose callers cache a compacted form, and copying them here would double that
+MAX_VALIDATED_BODY_BYTES = 256 * 1024
+
+
+def get_json(
+    session: requests.Session, url: str, params: Any = None, timeout: float = 20, ttl: float = DEFAULT_TTL
+) -> Any:
+    """GET a JSON resource, revalidating the last copy with If-None-Match / If-Modified-Since.
+
+    When upstream answers 304 the stored body is returned, so an unchanged
+    resource costs a header exchange instead of a full payload. Bodies are only
+    stored when upstream sends an ETag or Last-Modified validator and the body
+    is at most `MAX_VALIDATED_BODY_BYTES`. `ttl` is how long the caller caches
+    the result; the copy is kept for two of those, so the caller's next refresh
+    can still revalidate.
+    """
+    cache = get_shared_cache()
+    # Hashed: params may carry API keys
+    key = hashlib.sha256(make_key(url, params).encode("utf-8")).hexdigest()
+    stored = cache.get_entry("http_validators", key)
+    stored_value = stored[0] if stored else None
+
+    headers = {}
+    if stored_value:
+        if stored_value.get("etag"):
+            headers["If-None-Match"] = stored_value["etag"]
+        if stored_value.get("last_modified"):
+            headers["If-Modified-Since"] = stored_value["last_modified"]
+
+    with span(f"upstream {url.rsplit('/v1/', 1)[-1]}"):
+        resp = session.get(url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and stored_value:
+        logger.debug("Upstream not modified: %s", url)
+        return stored_value["body"]
+    resp.raise_for_status()
+    with span("json decode"):
+        body = resp.json()
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if (etag or last_modified) and len(resp.content) <= MAX_VALIDATED_BODY_BYTES:
+        cache.set(
+            "http_validators",
+            key,
+            {"etag": etag, "last_modified": last_modified, "body": body},
+            2 * ttl,
+        )
+    elif stored_value:
+        cache.delete("http_validators", key)
+    return body
+
+
+def stream_json_items(
+    session: requests.Session, url: str, key: str, params: Any = None, timeout: float = 20
+) -> Iterator[Any]:
+    """GET a JSON resource and yield the elements of its `key` arrays as they arrive.
+
+    For large payloads that are compacted right away: the full body is never
+    held in memory, and closing the generator early closes the connection.
+    No validators are kept, so callers cache the compacted result instead.
+    """
+    with span(f"upstream {url.rsplit('/v1/', 1)[-1]} (stream)"):
+        resp = session.get(url, params=params, timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+        yield from iter_array_items(iter_text(resp.iter_content(CHUNK_SIZE)), key)
+    finally:
+        resp.close()
@@ -0,0 +1,159 @@
+"""Background jobs for expensive aggregate requests.
+
+A job is a registered `kind` plus JSON params. `submit` returns a job id at
+once; the work runs on a bounded per-process pool. Job records (status,
+result, error) live in the shared cache, so any worker can answer a poll.
+
+Identical submissions (same kind, params and callback URL) return the
+existing job while it is pending or while its result is still within
+`JOB_RESULT_TTL`. Failed jobs are not deduplicated, so a retry really runs
+again.
+
+When a callback URL is given and its host is listed in `JOB_CALLBACK_HOSTS`,
+the finished record is POSTed to it. Redirects are not followed, so an
+allowed host cannot bounce the callback elsewhere.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config import settings
+from shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = 4
+# Jobs accepted by one process but not yet finished
+JOB_MAX_PENDING = 32
+JOB_RESULT_TTL = 15 * 60
+# Records of queued/running jobs expire after this, so a job orphaned by a dead worker can be resubmitted
+JOB_MAX_RUNTIME = 10 * 60
+CALLBACK_TIMEOUT = 5
+
+_handlers: Dict[str, Callable[[dict], Any]] = {}
+_pool: Optional[ThreadPoolExecutor] = None
+_slots = threading.BoundedSemaphore(JOB_MAX_PENDING)
+_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    """Raised by `submit` when this process already has `JOB_MAX_PENDING` unfinished jobs."""
+
+
+class JobStoreUnavailable(Exception):
+    """Raised by `submit` when the shared cache is disabled, since no worker could ever report the job."""
+
+
+def register(kind: str, handler: Callable[[dict], Any]) -> None:
+    """Make `kind` submittable; `handler(params)` returns a JSON-serializable result."""
+    _handlers[kind] = handler
+
+
+def _dedupe_key(kind: str, params: dict, callback_url: Optional[str]) -> str:
+    return hashlib.sha256(
+        json.dumps([kind, params, callback_url], sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _save(job: dict) -> None:
+    ttl = JOB_RESULT_TTL if job["status"] in ("done", "failed") else JOB_MAX_RUNTIME
+    get_shared_cache().set("jobs", job["id"], job, ttl)
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+        return _pool
+
+
+def callback_allowed(url: str) -> bool:
+    allowed = {h.strip().lower() for h in (settings.JOB_CALLBACK_HOSTS or "").split(",") if h.strip()}
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and (parsed.hostname or "").lower() in allowed
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    return get_shared_cache().get("jobs", job_id)
+
+
+def submit(kind: str, params: dict, callback_url: Optional[str] = None) -> tuple[dict, bool]:
+    """Queue a job (or find the identical pending/recent one). Returns (job record, deduplicated)."""
+    if kind not in _handlers:
+        raise KeyError(kind)
+    cache = get_shared_cache()
+    if not cache.available():
+        raise JobStoreUnavailable()
+    key = _dedupe_key(kind, params, callback_url)
+    existing_id = cache.get("job_keys", key)
+    if existing_id:
+        existing = get_job(existing_id)
+        if existing is not None and existing["status"] != "failed":
+            return existing, True
+
+    if not _slots.acquire(blocking=False):
+        raise JobQueueFull()
+    job = {
+        "id": uuid.uuid4().hex,
+        "kind": kind,
+        "params": params,
+        "status": "queued",
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+        "callback_url": callback_url,
+    }
+    try:
+        _save(job)
+        # Not atomic across workers: two simultaneous identical submits may both run, which is harmless
+        cache.set("job_keys", key, job["id"], JOB_MAX_RUNTIME)
+        _get_pool().submit(_run, job, key)
+    except Exception:
+        _slots.release()
+        raise
+    return job, False
+
+
+def _run(job: dict, key: str) -> None:
+    cache = get_shared_cache()
+    try:
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        _save(job)
+        try:
+            job["result"] = _handlers[job["kind"]](job["params"])
+            job["status"] = "done"
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job["id"], job["kind"])
+            job["status"] = "failed"
+            job["error"] = str(e) or type(e).__name__
+        job["finished_at"] = time.time()
+        _save(job)
+        if job["status"] == "done":
+            cache.set("job_keys", key, job["id"], JOB_RESULT_TTL)
+        else:
+            cache.delete("job_keys", key)
+        if job["callback_url"]:
+            _send_callback(job)
+    finally:
+        _slots.release()
+
+
+def _send_callback(job: dict) -> None:
+    try:
+        requests.post(job["callback_url"], json=job, timeout=CALLBACK_TIMEOUT, allow_redirects=False)
+    except Exception as e:  # pragma: no cover
+        logger.warning("Callback for job %s failed: %s", job["id"], e)
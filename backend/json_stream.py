@@ -0,0 +1,123 @@
+"""Incremental extraction of array items from a streamed JSON document.
+
+statsapi payloads are a thin envelope around big arrays (`dates[].games[]`,
+`stats[]`). `iter_array_items(chunks, "games")` scans the text as it arrives
+for `"games": [` and decodes one element at a time with
+`JSONDecoder.raw_decode`, so only the current element and one network chunk
+are held in memory, and a consumer that stops early stops the download.
+
+Elements are decoded whole, so keys nested inside them are never matched;
+envelope text between arrays is skipped without building objects.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+_WS = " \t\r\n"
+
+
+def iter_text(byte_chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 byte chunks, keeping multi-byte characters split across chunks intact."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_array_items(chunks: Iterable[str], key: str) -> Iterator[Any]:
+    """Yield the elements of every `key: [...]` array outside previously yielded elements, in order."""
+    decoder = json.JSONDecoder()
+    token = f'"{key}"'
+    source = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        # Append the next chunk, dropping everything before `pos` (positions are rebased to 0)
+        nonlocal buf, pos, eof
+        for chunk in source:
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+                return True
+        eof = True
+        return False
+
+    def skip_ws(i: int) -> int:
+        n = len(buf)
+        while i < n and buf[i] in _WS:
+            i += 1
+        return i
+
+    in_array = False
+    while True:
+        if not in_array:
+            i = buf.find(token, pos)
+            if i < 0:
+                # Keep a tail that may hold the start of a split token
+                pos = max(pos, len(buf) - len(token))
+                if not more():
+                    return
+                continue
+            j = skip_ws(i + len(token))
+            k = skip_ws(j + 1) if j < len(buf) and buf[j] == ":" else j
+            if k >= len(buf):
+                pos = i
+                if not more():
+                    return
+                continue
+            if buf[j] != ":":
+                # The token was a string value, not a key
+                pos = i + 1
+                continue
+            if buf[k] != "[":
+                pos = k
+                continue
+            pos = k + 1
+            in_array = True
+            continue
+
+        k = skip_ws(pos)
+        if k >= len(buf):
+            pos = k
+            if not more():
+                raise ValueError(f"JSON ended inside the {key!r} array")
+            continue
+        c = buf[k]
+        if c == "]":
+            in_array = False
+            pos = k + 1
+            continue
+        if c == ",":
+            pos = k + 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, k)
+        except json.JSONDecodeError:
+            pos = k
+            if not more():
+                raise
+            continue
+        if end >= len(buf) and not eof:
+            # A scalar cut at the chunk boundary would decode short; re-read with more data
+            pos = k
+            more()
+            continue
+        if isinstance(item, (int, float)) and not isinstance(item, bool) and not eof:
+            # "8." or "8e" cut at the boundary decodes as 8; only trust a number once its delimiter has arrived
+            n = skip_ws(end)
+            if n >= len(buf) or buf[n] not in ",]":
+                pos = k
+                more()
+                continue
+        pos = end
+        yield item
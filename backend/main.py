@@ -1,20 +1,35 @@
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, timedelta, timezone
-from dotenv import load_dotenv
+import hashlib
+import json
 import os
 
 from config import settings
-from mlb_service import resolve_team_id, find_next_game, get_schedule, compare_teams, GameInfo
-from news_service import NewsService, NewsArticle
-from youtube_service import search_videos, VideoItem
+import jobs
+from admission import AdmissionMiddleware
+from profiling import ProfilingMiddleware, get_profile, recent_profiles, span
+from mlb_service import resolve_team_id, find_next_game, next_game_in, get_schedule, compare_teams, get_season_games
+from analytics import team_trends
+from player_service import find_players, get_player_index, get_player_stats
+from news_service import NewsService
+from youtube_service import fetch_transcript_text, search_videos
 from sports_data_service import SportsDataService
+from summary_store import get_report
+from views import ARTICLE_FIELDS, GAME_FIELDS, TREND_SECTIONS, VIDEO_FIELDS, ViewParams, project, project_stat, select_fields
 
-load_dotenv()
 app = FastAPI(title="Hackathon AI Backend", version="0.1.0")
 
+# Opt-in request profiling (x-profile: 1 or PROFILE_SAMPLE_RATE); inside admission so shed requests are not profiled
+app.add_middleware(ProfilingMiddleware)
+
+# Rate limits and load shedding for /tools/*; added before CORS so rejections still get CORS headers
+app.add_middleware(AdmissionMiddleware)
+
 # CORS for local dev (Next.js and Netlify dev)
 origins = [
     "http://localhost:3000",
@@ -29,24 +44,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "x-profile-id", "Retry-After", "x-served-stale"],
 )
 
-
-class CheckScheduleRequest(BaseModel):
+# Outermost, so admission's stale copies stay uncompressed and are encoded per caller
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
+# Per-tool freshness advertised in Cache-Control (seconds)
+TOOL_MAX_AGE: Dict[str, int] = {
+    "check_schedule": 60,
+    "news": 300,
+    "youtube": 600,
+    "compare_stats": 600,
+    "team_trends": 120,
+    "team_intelligence": 300,
+    "player_stats": 300,
+    "team_report": 60,
+}
+# Fields that change on every call without the content changing; left out of ETags
+_ETAG_VOLATILE_KEYS = ("generated_at", "refreshed_at", "refreshing")
+
+
+class CheckScheduleRequest(ViewParams):
     team: str = Field(..., description="Team name or alias, e.g., 'Yankees'")
     days: int = Field(14, ge=1, le=60, description="Days ahead to search for next game")
     from_iso: Optional[str] = Field(None, description="ISO datetime to start from; defaults to now")
     tool_token: Optional[str] = None
 
 
-class NewsRequest(BaseModel):
+class NewsRequest(ViewParams):
     team: str
     days_back: int = Field(7, ge=1, le=30)
     max_results: int = Field(10, ge=1, le=50)
     tool_token: Optional[str] = None
 
 
-class YouTubeRequest(BaseModel):
+class YouTubeRequest(ViewParams):
     query: Optional[str] = None
     team: Optional[str] = None
     max_results: int = Field(10, ge=1, le=50)
@@ -60,7 +93,7 @@ class CompareStatsRequest(BaseModel):
     tool_token: Optional[str] = None
 
 
-class TeamIntelRequest(BaseModel):
+class TeamIntelRequest(ViewParams):
     team: str
     days_back: int = Field(7, ge=1, le=30)
     max_news: int = Field(10, ge=1, le=50)
@@ -68,28 +101,61 @@ class TeamIntelRequest(BaseModel):
     tool_token: Optional[str] = None
 
 
-class GameOut(BaseModel):
-    game_pk: int
-    game_date: str
-    home_team: str
-    away_team: str
-    is_home: bool
-    opponent: str
-    venue: Optional[str] = None
-    status: str
-
-    @staticmethod
-    def from_game(g: GameInfo) -> "GameOut":
-        return GameOut(
-            game_pk=g.game_pk,
-            game_date=g.game_date.isoformat(),
-            home_team=g.home_team,
-            away_team=g.away_team,
-            is_home=g.is_home,
-            opponent=g.opponent,
-            venue=g.venue,
-            status=g.status,
-        )
+class TeamReportRequest(BaseModel):
+    team: str
+    opponent: Optional[str] = Field(None, description="Second team for a matchup report")
+    days_back: int = Field(7, ge=1, le=30)
+    tool_token: Optional[str] = None
+
+
+class TeamTrendsRequest(ViewParams):
+    team: str
+    opponent: Optional[str] = Field(None, description="Optional opponent for head-to-head, e.g., 'Red Sox'")
+    season: Optional[int] = None
+    last_n: int = Field(10, ge=1, le=162, description="Size of the recent-form window")
+    window: int = Field(10, ge=2, le=81, description="Games per rolling win% window")
+    tool_token: Optional[str] = None
+
+
+class PlayerStatsRequest(ViewParams):
+    player: str = Field(..., description="Player name, last name or nickname, e.g., 'Ohtani'")
+    team: Optional[str] = Field(None, description="Optional team to disambiguate, e.g., 'Dodgers'")
+    season: Optional[int] = None
+    group: Optional[Literal["hitting", "pitching"]] = Field(
+        None, description="Stat group; defaults to the player's position (both for two-way players)"
+    )
+    tool_token: Optional[str] = None
+
+
+class JobSubmitRequest(BaseModel):
+    kind: str = Field(..., description="Job kind: 'matchup_report', 'transcripts' or 'season_comparison'")
+    params: Dict[str, Any] = Field(default_factory=dict)
+    callback_url: Optional[str] = Field(None, description="Optional URL to POST the finished job to")
+    tool_token: Optional[str] = None
+
+
+class JobRequest(BaseModel):
+    job_id: str
+    tool_token: Optional[str] = None
+
+
+class MatchupReportParams(BaseModel):
+    team1: str
+    team2: str
+    days_back: int = Field(7, ge=1, le=30)
+
+
+class TranscriptsParams(BaseModel):
+    video_ids: List[str] = Field(default_factory=list, max_length=10)
+    query: Optional[str] = None
+    team: Optional[str] = None
+    max_videos: int = Field(3, ge=1, le=10)
+
+
+class SeasonComparisonParams(BaseModel):
+    team1: str
+    team2: str
+    season: Optional[int] = None
 
 
 def _check_auth(header_token: Optional[str], body_token: Optional[str]) -> None:
@@ -102,11 +168,71 @@ def _check_auth(header_token: Optional[str], body_token: Optional[str]) -> None:
         raise HTTPException(status_code=401, detail="Invalid or missing tool token")
 
 
+def _fields(kind: str, params: ViewParams, allowed, known=None) -> tuple:
+    try:
+        return select_fields(kind, params, allowed, known)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidates)
+
+
+def _tool_response(request: Request, tool: str, payload: Dict[str, Any]) -> Response:
+    """JSON response with a content-hash ETag and per-tool Cache-Control.
+
+    Answers 304 with no body when the caller's If-None-Match already has this content.
+    """
+    with span("serialize"):
+        stable = {k: v for k, v in payload.items() if k not in _ETAG_VOLATILE_KEYS}
+        digest = hashlib.sha256(
+            json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        ).hexdigest()
+        etag = f'"{digest[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": f"private, max-age={TOOL_MAX_AGE.get(tool, 0)}"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(payload, headers=headers)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+@app.get("/admin/profiles")
+def admin_profiles(x_tool_token: Optional[str] = Header(None)):
+    """Summaries of the most recent request profiles, newest first."""
+    _check_auth(x_tool_token, None)
+    return {"profiles": recent_profiles()}
+
+
+@app.get("/admin/profiles/{profile_id}")
+def admin_profile(profile_id: str, format: str = "speedscope", x_tool_token: Optional[str] = Header(None)):
+    """One profile as speedscope JSON (open in speedscope.app) or collapsed stacks (`format=collapsed`)."""
+    _check_auth(x_tool_token, None)
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    filename = f"profile-{profile.id}"
+    if format == "collapsed":
+        return PlainTextResponse(
+            profile.collapsed(),
+            headers={"Content-Disposition": f'attachment; filename="{filename}.folded"'},
+        )
+    if format != "speedscope":
+        raise HTTPException(status_code=400, detail="format must be 'speedscope' or 'collapsed'")
+    return JSONResponse(
+        profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'},
+    )
+
+
 # Placeholder and ping for tools
 @app.post("/tools/echo")
 def tool_echo(payload: Dict[str, Any], x_tool_token: Optional[str] = Header(None)):
@@ -115,68 +241,62 @@ def tool_echo(payload: Dict[str, Any], x_tool_token: Optional[str] = Header(None
 
 
 @app.post("/tools/check_schedule")
-def tools_check_schedule(req: CheckScheduleRequest, x_tool_token: Optional[str] = Header(None)):
+def tools_check_schedule(req: CheckScheduleRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
     _check_auth(x_tool_token, req.tool_token)
     resolved = resolve_team_id(req.team)
     if not resolved:
         raise HTTPException(status_code=404, detail=f"Team not found for input: {req.team}")
     team_id, team_name = resolved
-    from_dt = datetime.fromisoformat(req.from_iso) if req.from_iso else datetime.now(timezone.utc)
+    # Default start is truncated to the minute so repeated calls produce the same ETag
+    from_dt = datetime.fromisoformat(req.from_iso) if req.from_iso else datetime.now(timezone.utc).replace(second=0, microsecond=0)
     # Normalize to timezone-aware (UTC) if input lacked tzinfo
     if from_dt.tzinfo is None:
         from_dt = from_dt.replace(tzinfo=timezone.utc)
-    next_game = find_next_game(team_id, from_dt=from_dt, search_days=req.days)
+    fields = _fields("game", req, GAME_FIELDS)
     end_date = from_dt.date() + timedelta(days=req.days)
-    sched = get_schedule(team_id, from_dt.date(), end_date)
-    return {
+    # The minimal view answers "when is the next game" only; find_next_game stops reading the schedule early
+    with_schedule = req.view != "minimal" or req.fields is not None
+    if with_schedule:
+        sched = get_schedule(team_id, from_dt.date(), end_date)
+        next_game = next_game_in(sched, from_dt)
+    else:
+        next_game = find_next_game(team_id, from_dt=from_dt, search_days=req.days)
+    payload = {
         "team_id": team_id,
         "team_name": team_name,
         "from": from_dt.isoformat(),
         "to": end_date.isoformat(),
-        "next_game": GameOut.from_game(next_game).model_dump() if next_game else None,
-        "schedule": [GameOut.from_game(g).model_dump() for g in sched],
+        "next_game": project([next_game], GAME_FIELDS, fields)[0] if next_game else None,
     }
+    if with_schedule:
+        payload["schedule"] = project(sched, GAME_FIELDS, fields)
+    return _tool_response(request, "check_schedule", payload)
 
 
 @app.post("/tools/news")
-def tools_news(req: NewsRequest, x_tool_token: Optional[str] = Header(None)):
+def tools_news(req: NewsRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
     _check_auth(x_tool_token, req.tool_token)
+    fields = _fields("article", req, ARTICLE_FIELDS)
     service = NewsService()
     articles = service.search_team_news(req.team, req.days_back, req.max_results)
-    def article_to_dict(a: NewsArticle) -> Dict[str, Any]:
-        return {
-            "title": a.title,
-            "description": a.description,
-            "url": a.url,
-            "source": a.source,
-            "published_at": a.published_at.isoformat(),
-            "url_to_image": a.url_to_image,
-        }
-    return {"team": req.team, "articles": [article_to_dict(a) for a in articles]}
+    return _tool_response(request, "news", {"team": req.team, "articles": project(articles, ARTICLE_FIELDS, fields)})
 
 
 @app.post("/tools/youtube")
-def tools_youtube(req: YouTubeRequest, x_tool_token: Optional[str] = Header(None)):
+def tools_youtube(req: YouTubeRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
     _check_auth(x_tool_token, req.tool_token)
     query = req.query
     if not query and req.team:
         query = f"{req.team} MLB highlights analysis"
     if not query:
         raise HTTPException(status_code=400, detail="Provide 'query' or 'team'")
-    items = search_videos(query, max_results=req.max_results)
-    def video_to_dict(v: VideoItem) -> Dict[str, Any]:
-        return {
-            "video_id": v.video_id,
-            "title": v.title,
-            "url": v.url,
-            "channel": v.channel,
-            "view_count": v.view_count,
-        }
-    return {"query": query, "results": [video_to_dict(v) for v in items]}
+    fields = _fields("video", req, VIDEO_FIELDS)
+    items = search_videos(query, max_results=req.max_results, team=req.team)
+    return _tool_response(request, "youtube", {"query": query, "results": project(items, VIDEO_FIELDS, fields)})
 
 
 @app.post("/tools/compare_stats")
-def tools_compare_stats(req: CompareStatsRequest, x_tool_token: Optional[str] = Header(None)):
+def tools_compare_stats(req: CompareStatsRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
     _check_auth(x_tool_token, req.tool_token)
     r1 = resolve_team_id(req.team1)
     r2 = resolve_team_id(req.team2)
@@ -185,40 +305,214 @@ def tools_compare_stats(req: CompareStatsRequest, x_tool_token: Optional[str] =
     team1_id, team1_name = r1
     team2_id, team2_name = r2
     cmp = compare_teams(team1_id, team2_id, season=req.season)
-    return {
+    return _tool_response(request, "compare_stats", {
         "team1": {"id": team1_id, "name": team1_name},
         "team2": {"id": team2_id, "name": team2_name},
         "comparison": cmp,
-    }
+    })
+
+
+@app.post("/tools/team_trends")
+def tools_team_trends(req: TeamTrendsRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
+    _check_auth(x_tool_token, req.tool_token)
+    resolved = resolve_team_id(req.team)
+    if not resolved:
+        raise HTTPException(status_code=404, detail=f"Team not found for input: {req.team}")
+    team_id, team_name = resolved
+    opponent = None
+    if req.opponent:
+        opponent = resolve_team_id(req.opponent)
+        if not opponent:
+            raise HTTPException(status_code=404, detail=f"Team not found for input: {req.opponent}")
+    sections = _fields("trends", req, TREND_SECTIONS)
+    season = req.season or datetime.now().year
+    table = get_season_games(season)
+    trends = team_trends(table, team_id, opponent[0] if opponent else None, req.last_n, req.window, sections)
+    return _tool_response(request, "team_trends", {
+        "team": {"id": team_id, "name": team_name},
+        "opponent": {"id": opponent[0], "name": opponent[1]} if opponent else None,
+        "trends": trends,
+    })
 
 
 @app.post("/tools/team_intelligence")
-def tools_team_intel(req: TeamIntelRequest, x_tool_token: Optional[str] = Header(None)):
+def tools_team_intel(req: TeamIntelRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
     _check_auth(x_tool_token, req.tool_token)
+    # `fields` may mix article and video field names
+    known = {**ARTICLE_FIELDS, **VIDEO_FIELDS}
+    news_fields = _fields("article", req, ARTICLE_FIELDS, known)
+    video_fields = _fields("video", req, VIDEO_FIELDS, known)
     svc = SportsDataService()
     intel = svc.get_team_intelligence(req.team, req.days_back, req.max_news, req.max_videos)
-    return {
+    return _tool_response(request, "team_intelligence", {
         "team": intel.team_name,
         "generated_at": intel.generated_at.isoformat(),
-        "news": [
-            {
-                "title": n.title,
-                "description": n.description,
-                "url": n.url,
-                "source": n.source,
-                "published_at": n.published_at.isoformat(),
-                "url_to_image": n.url_to_image,
-            }
-            for n in intel.news_articles
-        ],
-        "youtube": [
-            {
-                "video_id": v.video_id,
-                "title": v.title,
-                "url": v.url,
-                "channel": v.channel,
-                "view_count": v.view_count,
-            }
-            for v in intel.youtube_videos
+        "news": project(intel.news_articles, ARTICLE_FIELDS, news_fields),
+        "youtube": project(intel.youtube_videos, VIDEO_FIELDS, video_fields),
+    })
+
+
+@app.post("/tools/team_report")
+def tools_team_report(req: TeamReportRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
+    """The latest stored intelligence report; stale ones are refreshed in the background."""
+    _check_auth(x_tool_token, req.tool_token)
+    try:
+        record, refreshing = get_report(req.team, req.opponent, req.days_back)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _tool_response(request, "team_report", {
+        "subject": record["subject"],
+        "report": record["report"],
+        "updated_at": datetime.fromtimestamp(record["updated_at"], timezone.utc).isoformat(),
+        "refreshed_at": datetime.fromtimestamp(record["refreshed_at"], timezone.utc).isoformat(),
+        "refreshing": refreshing,
+    })
+
+
+@app.post("/tools/player_stats")
+def tools_player_stats(req: PlayerStatsRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
+    _check_auth(x_tool_token, req.tool_token)
+    team_id = None
+    if req.team:
+        resolved = resolve_team_id(req.team)
+        if not resolved:
+            raise HTTPException(status_code=404, detail=f"Team not found for input: {req.team}")
+        team_id = resolved[0]
+    season = req.season or datetime.now().year
+    # Before opening day the current season's player list or stat lines can still be empty;
+    # answer from the last season then, falling back at most once
+    fallback = req.season is None
+    if fallback and not get_player_index(season).players:
+        season -= 1
+        fallback = False
+    matches = find_players(req.player, season, team_id)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"Player not found for input: {req.player}")
+    player = matches[0]
+    groups = [req.group] if req.group else None
+    stats = get_player_stats(player, season, groups)
+    if not stats and fallback:
+        season -= 1
+        stats = get_player_stats(player, season, groups)
+    return _tool_response(request, "player_stats", {
+        "player": {
+            "id": player.player_id,
+            "name": player.name,
+            "team": player.team_name,
+            "position": player.position,
+            "number": player.number,
+        },
+        "season": season,
+        "stats": {group: project_stat(stat, group, req) for group, stat in stats.items()},
+        "other_matches": [
+            {"id": p.player_id, "name": p.name, "team": p.team_name} for p in matches[1:]
         ],
+    })
+
+
+# Background jobs: heavy aggregate work runs on the job pool and is polled by id (see jobs.py)
+
+def _job_matchup_report(params: dict) -> dict:
+    svc = SportsDataService()
+    matchup = svc.get_opponent_analysis(params["team1"], params["team2"], params["days_back"])
+    return {
+        "summary": svc.generate_matchup_summary(matchup),
+        "reports": {team: svc.generate_intelligence_summary(intel) for team, intel in matchup.items()},
     }
+
+
+def _job_transcripts(params: dict) -> dict:
+    video_ids = params["video_ids"]
+    if not video_ids:
+        query = params["query"] or (f"{params['team']} MLB highlights analysis" if params["team"] else None)
+        if not query:
+            raise ValueError("Provide 'video_ids', 'query' or 'team'")
+        video_ids = [v.video_id for v in search_videos(query, max_results=params["max_videos"], team=params["team"])]
+    return {"transcripts": [{"video_id": vid, "text": fetch_transcript_text(vid)} for vid in video_ids]}
+
+
+def _job_season_comparison(params: dict) -> dict:
+    r1 = resolve_team_id(params["team1"])
+    r2 = resolve_team_id(params["team2"])
+    if not r1 or not r2:
+        raise ValueError("One or both teams could not be resolved")
+    season = params["season"] or datetime.now().year
+    table = get_season_games(season)
+    return {
+        "team1": {"id": r1[0], "name": r1[1]},
+        "team2": {"id": r2[0], "name": r2[1]},
+        "comparison": compare_teams(r1[0], r2[0], season=season),
+        "trends": {
+            r1[1]: team_trends(table, r1[0], r2[0]),
+            r2[1]: team_trends(table, r2[0], r1[0]),
+        },
+    }
+
+
+JOB_PARAMS: Dict[str, type] = {
+    "matchup_report": MatchupReportParams,
+    "transcripts": TranscriptsParams,
+    "season_comparison": SeasonComparisonParams,
+}
+jobs.register("matchup_report", _job_matchup_report)
+jobs.register("transcripts", _job_transcripts)
+jobs.register("season_comparison", _job_season_comparison)
+
+
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
+
+
+def _load_job(job_id: str) -> Dict[str, Any]:
+    job = jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found or expired: {job_id}")
+    return job
+
+
+@app.post("/tools/jobs/submit", status_code=202)
+def tools_job_submit(req: JobSubmitRequest, x_tool_token: Optional[str] = Header(None)):
+    _check_auth(x_tool_token, req.tool_token)
+    model = JOB_PARAMS.get(req.kind)
+    if model is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {req.kind}; available: {', '.join(JOB_PARAMS)}")
+    try:
+        # Normalized params (defaults filled in) so equivalent submissions dedupe
+        params = model(**req.params).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+    if req.callback_url and not jobs.callback_allowed(req.callback_url):
+        raise HTTPException(status_code=400, detail="callback_url host is not in JOB_CALLBACK_HOSTS")
+    try:
+        job, deduplicated = jobs.submit(req.kind, params, req.callback_url)
+    except jobs.JobQueueFull:
+        raise HTTPException(status_code=429, detail="Job queue full", headers={"Retry-After": "5"})
+    except jobs.JobStoreUnavailable:
+        raise HTTPException(status_code=503, detail="Job store unavailable")
+    return JSONResponse({**_job_status(job), "deduplicated": deduplicated}, status_code=202)
+
+
+@app.post("/tools/jobs/status")
+def tools_job_status(req: JobRequest, x_tool_token: Optional[str] = Header(None)):
+    _check_auth(x_tool_token, req.tool_token)
+    return _job_status(_load_job(req.job_id))
+
+
+@app.post("/tools/jobs/result")
+def tools_job_result(req: JobRequest, request: Request, x_tool_token: Optional[str] = Header(None)):
+    """The job's result once done; 202 with its status while pending, 500 with the error if it failed."""
+    _check_auth(x_tool_token, req.tool_token)
+    job = _load_job(req.job_id)
+    if job["status"] in ("queued", "running"):
+        return JSONResponse(_job_status(job), status_code=202, headers={"Retry-After": "2"})
+    if job["status"] == "failed":
+        return JSONResponse(_job_status(job), status_code=500)
+    return _tool_response(request, "jobs/result", {**_job_status(job), "result": job["result"]})
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
 import logging
+import time
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 
+from game_table import GameTable
+from http_cache import get_json, stream_json_items
 from news_service import get_team_search_terms
+from profiling import span, traced
+from season_pack import load_season_pack
+from shared_cache import get_shared_cache, make_key
 
 logger = logging.getLogger(__name__)
 
 STATS_API = "https://statsapi.mlb.com/api/v1"
 
+# Shared-cache lifetimes (seconds)
+TEAMS_TTL = 24 * 3600
+SCHEDULE_TTL = 5 * 60
+LEAGUE_STATS_TTL = 30 * 60
+SEASON_GAMES_TTL = 10 * 60
+
 _session = requests.Session()
 _team_cache: List[dict] | None = None
+# season -> (loaded_at, table) for seasons not covered by a season pack
+_season_tables: Dict[int, Tuple[float, GameTable]] = {}
 
 
 @dataclass
@@ -27,23 +42,45 @@ class GameInfo:
     opponent: str
     venue: Optional[str]
     status: str
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    # "W"/"L" from the requested team's perspective once the game is final
+    result: Optional[str] = None
+
+
+def _result(is_home: bool, home_score: Optional[int], away_score: Optional[int], status: str) -> Optional[str]:
+    if home_score is None or away_score is None or home_score == away_score:
+        return None
+    if not status.lower().startswith(("final", "game over", "completed early")):
+        return None
+    team_score, opp_score = (home_score, away_score) if is_home else (away_score, home_score)
+    return "W" if team_score > opp_score else "L"
+
 
+def get_session() -> requests.Session:
+    """The pooled statsapi session, shared with other statsapi clients (player_service)."""
+    return _session
 
-def _load_teams() -> List[dict]:
+
+def load_teams() -> List[dict]:
+    """Active MLB teams as returned by `/teams`."""
     global _team_cache
     if _team_cache is not None:
         return _team_cache
-    params = {"sportId": 1, "activeStatus": "Yes"}
-    resp = _session.get(f"{STATS_API}/teams", params=params, timeout=20)
-    resp.raise_for_status()
-    data = resp.json() or {}
-    _team_cache = data.get("teams", [])
+
+    def fetch() -> List[dict]:
+        params = {"sportId": 1, "activeStatus": "Yes"}
+        data = get_json(_session, f"{STATS_API}/teams", params=params, ttl=TEAMS_TTL) or {}
+        return data.get("teams", [])
+
+    _team_cache = get_shared_cache().get_or_load("mlb_teams", "active", TEAMS_TTL, fetch)
     return _team_cache
 
 
+@traced
 def resolve_team_id(team_input: str) -> Tuple[int, str] | None:
     """Resolve a user-provided team string to (teamId, teamName)."""
-    teams = _load_teams()
+    teams = load_teams()
     candidates = get_team_search_terms(team_input)
     normalized = {c.lower(): c for c in candidates}
 
@@ -74,97 +111,264 @@ def resolve_team_id(team_input: str) -> Tuple[int, str] | None:
     return None
 
 
+@traced
 def get_schedule(team_id: int, start: date, end: date) -> List[GameInfo]:
-    params = {
+    pack = load_season_pack(start.year) if start.year == end.year else None
+    if pack is not None:
+        games_out: List[GameInfo] = []
+        for row in pack.games.team_games(team_id, start, end):
+            game_pk, dt, home_id, _away_id, home_name, away_name, venue, status, home_score, away_score = row
+            is_home = home_id == team_id
+            games_out.append(
+                GameInfo(
+                    game_pk=game_pk,
+                    game_date=dt,
+                    home_team=home_name,
+                    away_team=away_name,
+                    is_home=is_home,
+                    opponent=away_name if is_home else home_name,
+                    venue=venue,
+                    status=status,
+                    home_score=home_score,
+                    away_score=away_score,
+                    result=_result(is_home, home_score, away_score, status),
+                )
+            )
+        return games_out
+
+    params = _schedule_params(team_id, start, end)
+    key = make_key(team_id, params["startDate"], params["endDate"])
+    rows = get_shared_cache().get_or_load(
+        "mlb_schedule_rows", key, SCHEDULE_TTL, lambda: list(_iter_schedule_rows(params))
+    )
+    with span("build games"):
+        return [_game_info(row, team_id) for row in rows]
+
+
+def _schedule_params(team_id: int, start: date, end: date) -> dict:
+    return {
         "teamId": team_id,
         "sportId": 1,
         "startDate": start.isoformat(),
         "endDate": end.isoformat(),
     }
-    resp = _session.get(f"{STATS_API}/schedule", params=params, timeout=20)
-    resp.raise_for_status()
-    data = resp.json() or {}
-    games: List[GameInfo] = []
-
-    for d in (data.get("dates") or []):
-        for g in (d.get("games") or []):
-            game_pk = g.get("gamePk")
-            status = (g.get("status") or {}).get("detailedState") or (g.get("status") or {}).get("abstractGameState")
-            game_date = g.get("gameDate")
-            dt = datetime.fromisoformat(game_date.replace("Z", "+00:00")) if game_date else datetime.now(timezone.utc)
-            teams = g.get("teams", {})
-            home_name = (teams.get("home") or {}).get("team", {}).get("name")
-            away_name = (teams.get("away") or {}).get("team", {}).get("name")
-            is_home = (teams.get("home") or {}).get("team", {}).get("id") == team_id
-            opponent = away_name if is_home else home_name
-            venue = (g.get("venue") or {}).get("name")
-
-            if game_pk and home_name and away_name and opponent:
-                games.append(
-                    GameInfo(
-                        game_pk=game_pk,
-                        game_date=dt,
-                        home_team=home_name,
-                        away_team=away_name,
-                        is_home=is_home,
-                        opponent=opponent,
-                        venue=venue,
-                        status=status or ""
-                    )
-                )
-    return games
 
 
+def _compact_game(g: dict) -> Optional[list]:
+    """The fields of a statsapi game object that GameInfo needs, or None if it lacks teams."""
+    teams = g.get("teams") or {}
+    home = teams.get("home") or {}
+    away = teams.get("away") or {}
+    home_team = home.get("team") or {}
+    away_team = away.get("team") or {}
+    status = g.get("status") or {}
+    if not (g.get("gamePk") and home_team.get("name") and away_team.get("name")):
+        return None
+    return [
+        g["gamePk"],
+        g.get("gameDate"),
+        home_team.get("id"),
+        home_team["name"],
+        away_team["name"],
+        (g.get("venue") or {}).get("name"),
+        status.get("detailedState") or status.get("abstractGameState") or "",
+        home.get("score"),
+        away.get("score"),
+    ]
+
+
+def _game_info(row: list, team_id: int) -> GameInfo:
+    game_pk, game_date, home_id, home_name, away_name, venue, status, home_score, away_score = row
+    is_home = home_id == team_id
+    return GameInfo(
+        game_pk=game_pk,
+        game_date=datetime.fromisoformat(game_date.replace("Z", "+00:00")) if game_date else datetime.now(timezone.utc),
+        home_team=home_name,
+        away_team=away_name,
+        is_home=is_home,
+        opponent=away_name if is_home else home_name,
+        venue=venue,
+        status=status,
+        home_score=home_score,
+        away_score=away_score,
+        result=_result(is_home, home_score, away_score, status),
+    )
+
+
+def _iter_schedule_rows(params: dict) -> Iterator[list]:
+    """Compact game rows of a `/schedule` query, parsed from the response stream game by game."""
+    with closing(stream_json_items(_session, f"{STATS_API}/schedule", "games", params=params)) as games:
+        for g in games:
+            row = _compact_game(g)
+            if row is not None:
+                yield row
+
+
+def _next_game_from(games: Iterable[GameInfo], from_dt: datetime) -> Tuple[Optional[GameInfo], bool]:
+    """Earliest upcoming game in date-ordered `games`.
+
+    Stops reading once a game starts more than a day after the current best
+    (the payload is ordered by official date, so nothing earlier can follow).
+    Returns (game, decided); decided is False when `games` ran out first.
+    """
+    best: Optional[GameInfo] = None
+    for g in games:
+        if best is not None and g.game_date - best.game_date > timedelta(days=1):
+            return best, True
+        if g.game_date >= from_dt and g.status.lower() not in {"final", "game over"}:
+            if best is None or g.game_date < best.game_date:
+                best = g
+    return best, False
+
+
+def next_game_in(games: List[GameInfo], from_dt: datetime) -> Optional[GameInfo]:
+    """Earliest upcoming game in an already fetched schedule."""
+    return _next_game_from(sorted(games, key=lambda g: g.game_date), from_dt)[0]
+
+
+@traced
 def find_next_game(team_id: int, from_dt: datetime | None = None, search_days: int = 14) -> Optional[GameInfo]:
+    """Next game that has not finished yet.
+
+    Served from the season pack or a cached schedule when available; otherwise
+    the schedule is streamed and the download stops as soon as the answer is
+    known. The streamed prefix is cached and reused while it still decides.
+    """
     from_dt = from_dt or datetime.now(timezone.utc)
     start = from_dt.date()
     end = start + timedelta(days=search_days)
-    games = get_schedule(team_id, start, end)
-    games.sort(key=lambda g: g.game_date)
-    for g in games:
-        if g.game_date >= from_dt and g.status.lower() not in {"final", "game over"}:
-            return g
-    return None
+    params = _schedule_params(team_id, start, end)
+    key = make_key(team_id, params["startDate"], params["endDate"])
+    cache = get_shared_cache()
+    pack = load_season_pack(start.year) if start.year == end.year else None
+    if pack is not None or cache.get("mlb_schedule_rows", key) is not None:
+        return next_game_in(get_schedule(team_id, start, end), from_dt)
+
+    prefix = cache.get("mlb_schedule_prefix", key)
+    if prefix is not None:
+        best, decided = _next_game_from((_game_info(r, team_id) for r in prefix), from_dt)
+        if decided:
+            return best
+
+    consumed: List[list] = []
+
+    def rows() -> Iterator[list]:
+        with closing(_iter_schedule_rows(params)) as it:
+            for row in it:
+                consumed.append(row)
+                yield row
+
+    with closing(rows()) as it:
+        best, decided = _next_game_from((_game_info(r, team_id) for r in it), from_dt)
+    # A full read is the whole schedule; an early stop is only good for next-game lookups
+    cache.set("mlb_schedule_prefix" if decided else "mlb_schedule_rows", key, consumed, SCHEDULE_TTL)
+    return best
+
+
+@traced
+def get_season_games(season: int) -> GameTable:
+    """League-wide game table for a season, with scores.
+
+    Completed seasons come from their season pack; otherwise the season schedule is
+    fetched once, compacted, shared across workers and memoized in-process.
+    """
+    pack = load_season_pack(season)
+    if pack is not None:
+        return pack.games
+    now = time.time()
+    cached = _season_tables.get(season)
+    if cached is not None and now - cached[0] < 60:
+        return cached[1]
+    data = get_shared_cache().get_or_load(
+        "mlb_season_table",
+        str(season),
+        SEASON_GAMES_TTL,
+        lambda: _stream_season_table(season).to_dict(),
+    )
+    table = GameTable.from_dict(data)
+    _season_tables[season] = (now, table)
+    return table
+
+
+def _stats_params(season: int) -> list:
+    return [
+        ("group", "hitting"),
+        ("group", "pitching"),
+        ("stats", "season"),
+        ("season", season),
+        ("sportId", 1),
+    ]
+
+
+def fetch_league_stats(season: int) -> dict:
+    """Raw league-wide `/teams/stats` payload for a season (used to build season packs)."""
+    return get_json(_session, f"{STATS_API}/teams/stats", params=_stats_params(season)) or {}
+
+
+def fetch_league_team_stats(season: int) -> Dict[str, Dict[str, dict]]:
+    """{group: {team id (str): stat line}} from `/teams/stats`, parsed one group block at a time."""
+
+    def fetch() -> Dict[str, Dict[str, dict]]:
+        out: Dict[str, Dict[str, dict]] = {}
+        url = f"{STATS_API}/teams/stats"
+        with closing(stream_json_items(_session, url, "stats", params=_stats_params(season))) as blocks:
+            for block in blocks:
+                group = ((block.get("group") or {}).get("displayName") or "").lower()
+                if not group:
+                    continue
+                by_team = out.setdefault(group, {})
+                for sp in block.get("splits") or []:
+                    team_id = (sp.get("team") or {}).get("id")
+                    if team_id and sp.get("stat"):
+                        by_team.setdefault(str(team_id), sp["stat"])
+        return out
+
+    return get_shared_cache().get_or_load(
+        "mlb_league_team_stats", str(season), LEAGUE_STATS_TTL, fetch, store_if=bool
+    )
+
+
+def _season_schedule_params(season: int) -> dict:
+    # Regular season and postseason
+    return {"sportId": 1, "season": season, "gameType": "R,F,D,L,W"}
+
+
+def fetch_season_schedule(season: int) -> dict:
+    """Raw league-wide `/schedule` payload for a full season (used to build season packs)."""
+    return get_json(_session, f"{STATS_API}/schedule", params=_season_schedule_params(season), timeout=60) or {}
 
 
+def _stream_season_table(season: int) -> GameTable:
+    url = f"{STATS_API}/schedule"
+    with closing(stream_json_items(_session, url, "games", params=_season_schedule_params(season), timeout=60)) as games:
+        return GameTable.from_games(season, games)
+
+
+@traced
 def get_team_stats(team_id: int, season: int | None = None) -> dict:
     """Return aggregated team stats for hitting and pitching.
 
     Primary source: `GET /teams/stats` with groups [hitting, pitching]. This endpoint
     returns league-wide splits; we filter by the provided `team_id`.
     Fallbacks: `/teams/{teamId}/stats` and a hydrate call via `/teams`.
+    Completed seasons with a built season pack are served locally.
     """
     if season is None:
         season = datetime.now().year
-    params_list = [
-        ("group", "hitting"),
-        ("group", "pitching"),
-        ("stats", "season"),
-        ("season", season),
-        ("sportId", 1),
-    ]
+    pack = load_season_pack(season)
+    if pack is not None:
+        packed = pack.team_stats(team_id)
+        if packed.get("hitting") or packed.get("pitching"):
+            return packed
+    params_list = _stats_params(season)
     out: dict = {"season": season}
 
-    # Primary: league endpoint; filter to our team
+    # Primary: league endpoint, compacted per group; pick our team
     try:
-        resp = _session.get(f"{STATS_API}/teams/stats", params=params_list, timeout=20)
-        resp.raise_for_status()
-        data = resp.json() or {}
-        results = (data.get("stats") or [])
-        for r in results:
-            group = (r.get("group") or {}).get("displayName")
-            if not group:
-                continue
-            splits = r.get("splits") or []
-            # Find the split for our team
-            team_stat: dict = {}
-            for sp in splits:
-                team_obj = (sp.get("team") or {})
-                if team_obj.get("id") == team_id:
-                    team_stat = (sp.get("stat") or {})
-                    break
+        for group, by_team in fetch_league_team_stats(season).items():
+            team_stat = by_team.get(str(team_id))
             if team_stat:
-                out[group.lower()] = team_stat
+                out[group] = team_stat
         if out.get("hitting") or out.get("pitching"):
             return out
     except Exception as e:
@@ -224,6 +428,7 @@ def get_team_stats(team_id: int, season: int | None = None) -> dict:
     return out
 
 
+@traced
 def compare_teams(team1_id: int, team2_id: int, season: int | None = None) -> dict:
     s1 = get_team_stats(team1_id, season)
     s2 = get_team_stats(team2_id, season)
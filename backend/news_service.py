@@ -3,14 +3,24 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional
-
-from newsapi import NewsApiClient
+from typing import Dict, List, Optional
 
+from alias_matcher import AliasMatcher
 from config import settings
+from profiling import traced
+from ranking import rank_distinct
+from shared_cache import get_shared_cache, make_key
 
 logger = logging.getLogger(__name__)
 
+NEWS_TTL = 15 * 60
+# Fetch this many times `max_results` so near-duplicates can be dropped without running short
+NEWS_OVERFETCH = 3
+# Batched multi-team mode: NewsAPI caps `q` at 500 characters and pages at 100 articles
+NEWS_QUERY_MAX_CHARS = 500
+NEWS_BATCH_PAGE_SIZE = 100
+NEWS_BATCH_MAX_PAGES = 3
+
 
 @dataclass
 class NewsArticle:
@@ -35,8 +45,12 @@ class NewsService:
             logger.warning("NEWS_API_KEY not found in environment variables")
             self.client = None
         else:
+            # Imported on first use so app startup does not pay for newsapi
+            from newsapi import NewsApiClient
+
             self.client = NewsApiClient(api_key=self.api_key)
 
+    @traced
     def search_team_news(
         self,
         team_name: str,
@@ -45,51 +59,180 @@ class NewsService:
     ) -> List[NewsArticle]:
         """
         Search for recent news articles about a specific topic or team.
+        Over-fetches, collapses syndicated near-duplicates and ranks by recency,
+        source weight and relevance to the team's aliases.
         """
         if not self.client:
             logger.error("NewsAPI client not initialized - missing API key")
             return []
 
         try:
-            to_date = datetime.now()
-            from_date = to_date - timedelta(days=days_back)
+            from_param, to_param = _date_window(days_back)
             # Generic query: do not inject MLB-specific terms so this can be reused broadly
             query = team_name.strip()
+            page_size = min(100, max(20, max_results * NEWS_OVERFETCH))
 
-            response = self.client.get_everything(
-                q=query,
-                from_param=from_date.strftime('%Y-%m-%d'),
-                to=to_date.strftime('%Y-%m-%d'),
-                language='en',
-                sort_by='publishedAt',
-                page_size=max_results,
-            )
+            def fetch() -> List[dict]:
+                response = self.client.get_everything(
+                    q=query,
+                    from_param=from_param,
+                    to=to_param,
+                    language='en',
+                    sort_by='publishedAt',
+                    page_size=page_size,
+                )
+                if response.get('status') != 'ok':
+                    # Raise so the error is not cached as "no news"; a stale copy is served instead
+                    raise RuntimeError(f"NewsAPI {response.get('code')}: {response.get('message')}")
+                return response.get('articles', [])
 
-            articles: List[NewsArticle] = []
-            if response.get('status') == 'ok':
-                for article_data in response.get('articles', []):
-                    try:
-                        published_at = article_data.get('publishedAt')
-                        dt = datetime.fromisoformat(published_at.replace('Z', '+00:00')) if published_at else datetime.now()
-                        article = NewsArticle(
-                            title=article_data.get('title') or '',
-                            description=article_data.get('description') or '',
-                            url=article_data.get('url') or '',
-                            source=(article_data.get('source') or {}).get('name') or 'Unknown',
-                            published_at=dt,
-                            url_to_image=article_data.get('urlToImage'),
-                        )
-                        articles.append(article)
-                    except Exception as e:  # pragma: no cover
-                        logger.warning("Error parsing article: %s", e)
-                        continue
+            cache = get_shared_cache()
+            # A batched multi-team fetch (search_many_teams) may already hold this team's articles
+            team_key = get_team_key(team_name)
+            raw_articles = cache.get("news_team", make_key(team_key, from_param, to_param)) if team_key else None
+            if raw_articles is None:
+                key = make_key(query.lower(), from_param, to_param, page_size)
+                raw_articles = cache.get_or_load("news_search", key, NEWS_TTL, fetch)
 
+            articles = _parse_articles(raw_articles)
+            articles = rank_distinct(
+                articles,
+                title=lambda a: a.title,
+                body=lambda a: a.description,
+                published_at=lambda a: a.published_at,
+                source=lambda a: a.source,
+                terms=get_team_search_terms(team_name),
+                limit=max_results,
+            )
             logger.info("Found %d articles for %s", len(articles), team_name)
             return articles
         except Exception as e:  # pragma: no cover
             logger.error("Error searching news for %s: %s", team_name, e)
             return []
 
+    @traced
+    def search_many_teams(
+        self,
+        teams: List[str],
+        days_back: int = 7,
+        max_results: int = 10,
+    ) -> Dict[str, List[NewsArticle]]:
+        """
+        Fetch news for several MLB teams with a handful of combined OR-queries.
+
+        Alias terms of all requested teams are packed into as few queries as the
+        500-character limit allows (paging as needed); every returned article is
+        assigned to each team it mentions using one Aho-Corasick pass over its
+        title and description. Per-team results fill the cache that
+        `search_team_news` reads, but only when paging reached `totalResults`.
+        Inputs that are not MLB teams, and teams whose combined query failed or
+        was cut off by the page cap, fall back to a single-team query.
+        Returns {team input: ranked distinct articles}.
+        """
+        out: Dict[str, List[NewsArticle]] = {t: [] for t in teams}
+        if not self.client:
+            logger.error("NewsAPI client not initialized - missing API key")
+            return out
+
+        from_param, to_param = _date_window(days_back)
+        cache = get_shared_cache()
+        team_keys = {t: get_team_key(t) for t in teams}
+        raw_by_key: Dict[str, List[dict]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(k for k in team_keys.values() if k):
+            cached = cache.get("news_team", make_key(key, from_param, to_param))
+            if cached is not None:
+                raw_by_key[key] = cached
+            else:
+                missing.append(key)
+
+        if missing:
+            matcher = _get_team_matcher()
+            fetched: Dict[str, Dict[str, dict]] = {k: {} for k in missing}
+            # Teams whose query failed or was cut off by NEWS_BATCH_MAX_PAGES: their lists may be
+            # short, so they are not cached and go through the per-team path instead
+            incomplete: set = set()
+            requests_made = 0
+            for query, query_keys in _build_or_queries(missing):
+                complete = False
+                for page in range(1, NEWS_BATCH_MAX_PAGES + 1):
+                    try:
+                        response = self.client.get_everything(
+                            q=query,
+                            from_param=from_param,
+                            to=to_param,
+                            language='en',
+                            sort_by='publishedAt',
+                            page_size=NEWS_BATCH_PAGE_SIZE,
+                            page=page,
+                        )
+                        requests_made += 1
+                    except Exception as e:  # pragma: no cover
+                        logger.error("Batched news query failed: %s", e)
+                        break
+                    if response.get('status') != 'ok':
+                        break
+                    page_articles = response.get('articles', [])
+                    for article_data in page_articles:
+                        text = f"{article_data.get('title') or ''} {article_data.get('description') or ''}"
+                        for key in matcher.labels_in(text):
+                            if key in fetched:
+                                fetched[key].setdefault(article_data.get('url') or text, article_data)
+                    total = response.get('totalResults') or 0
+                    if len(page_articles) < NEWS_BATCH_PAGE_SIZE or page * NEWS_BATCH_PAGE_SIZE >= total:
+                        complete = True
+                        break
+                if not complete:
+                    incomplete.update(query_keys)
+            logger.info("Batched news for %d teams in %d requests", len(missing), requests_made)
+            for key, by_url in fetched.items():
+                if key not in incomplete:
+                    raw_by_key[key] = list(by_url.values())
+                    cache.set("news_team", make_key(key, from_param, to_param), raw_by_key[key], NEWS_TTL)
+
+        for team in teams:
+            key = team_keys[team]
+            if key is None or key not in raw_by_key:
+                out[team] = self.search_team_news(team, days_back, max_results)
+                continue
+            out[team] = rank_distinct(
+                _parse_articles(raw_by_key.get(key, [])),
+                title=lambda a: a.title,
+                body=lambda a: a.description,
+                published_at=lambda a: a.published_at,
+                source=lambda a: a.source,
+                terms=MLB_TEAM_ALIASES[key],
+                limit=max_results,
+            )
+        return out
+
+
+def _date_window(days_back: int) -> tuple[str, str]:
+    to_date = datetime.now()
+    from_date = to_date - timedelta(days=days_back)
+    return from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')
+
+
+def _parse_articles(raw_articles: List[dict]) -> List[NewsArticle]:
+    articles: List[NewsArticle] = []
+    for article_data in raw_articles:
+        try:
+            published_at = article_data.get('publishedAt')
+            dt = datetime.fromisoformat(published_at.replace('Z', '+00:00')) if published_at else datetime.now()
+            article = NewsArticle(
+                title=article_data.get('title') or '',
+                description=article_data.get('description') or '',
+                url=article_data.get('url') or '',
+                source=(article_data.get('source') or {}).get('name') or 'Unknown',
+                published_at=dt,
+                url_to_image=article_data.get('urlToImage'),
+            )
+            articles.append(article)
+        except Exception as e:  # pragma: no cover
+            logger.warning("Error parsing article: %s", e)
+            continue
+    return articles
+
 
 # Common MLB team name mappings for better search results
 MLB_TEAM_ALIASES = {
@@ -126,10 +269,64 @@ MLB_TEAM_ALIASES = {
 }
 
 
-def get_team_search_terms(team_input: str) -> List[str]:
-    """Get optimized search terms for a team based on user input."""
+def get_team_key(team_input: str) -> Optional[str]:
+    """Return the MLB_TEAM_ALIASES key matching user input, or None."""
     team_lower = team_input.lower().strip()
     for key, aliases in MLB_TEAM_ALIASES.items():
         if team_lower in key or any(team_lower in alias.lower() for alias in aliases):
-            return aliases
+            return key
+    return None
+
+
+def find_team_key(team_input: str) -> Optional[str]:
+    """Return the MLB_TEAM_ALIASES key that `team_input` names exactly (key or alias, any case), or None.
+
+    Stricter than `get_team_key`, whose substring match accepts fragments like "a" or "new".
+    """
+    wanted = " ".join(team_input.lower().split())
+    for key, aliases in MLB_TEAM_ALIASES.items():
+        if wanted == key or any(wanted == alias.lower() for alias in aliases):
+            return key
+    return None
+
+
+def get_team_search_terms(team_input: str) -> List[str]:
+    """Get optimized search terms for a team based on user input."""
+    key = get_team_key(team_input)
+    if key is not None:
+        return MLB_TEAM_ALIASES[key]
     return [team_input.title()]
+
+
+_team_matcher: AliasMatcher | None = None
+
+
+def _get_team_matcher() -> AliasMatcher:
+    global _team_matcher
+    if _team_matcher is None:
+        _team_matcher = AliasMatcher(
+            (alias, key) for key, aliases in MLB_TEAM_ALIASES.items() for alias in aliases
+        )
+    return _team_matcher
+
+
+def _build_or_queries(team_keys: List[str]) -> List[tuple[str, List[str]]]:
+    """Pack the teams' quoted aliases into OR-queries within NEWS_QUERY_MAX_CHARS.
+
+    A team's aliases always stay in one query. Returns [(query, team keys)].
+    """
+    queries: List[tuple[str, List[str]]] = []
+    parts: List[str] = []
+    keys: List[str] = []
+    for key in team_keys:
+        # Longer aliases contain the short ones for matching, so the short form suffices in q
+        terms = [f'"{a}"' for a in MLB_TEAM_ALIASES[key] if not any(o != a and o in a for o in MLB_TEAM_ALIASES[key])]
+        candidate = " OR ".join(parts + terms)
+        if parts and len(candidate) > NEWS_QUERY_MAX_CHARS:
+            queries.append((" OR ".join(parts), keys))
+            parts, keys = [], []
+        parts.extend(terms)
+        keys.append(key)
+    if parts:
+        queries.append((" OR ".join(parts), keys))
+    return queries
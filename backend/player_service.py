@@ -0,0 +1,222 @@
+"""Player lookup and season stats.
+
+All players of a season are loaded with one bulk `/sports/1/players` call and
+indexed in memory by normalized name, so resolving "ohtani" or "Shohei"
+never costs a search round trip. Season stats come from one league-wide
+`/stats` call per group (hitting, pitching), compacted to
+{player id: stat line} and shared across workers; a player lookup is then
+two dictionary reads.
+"""
+from __future__ import annotations
+
+import bisect
+import difflib
+import logging
+import time
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from http_cache import get_json
+from mlb_service import STATS_API, get_session, load_teams
+from profiling import traced
+from season_pack import is_completed_season
+from shared_cache import get_shared_cache, make_key
+
+logger = logging.getLogger(__name__)
+
+# Shared-cache lifetimes (seconds); completed seasons no longer change
+ROSTER_TTL = 6 * 3600
+PLAYER_STATS_TTL = 30 * 60
+COMPLETED_SEASON_TTL = 7 * 24 * 3600
+# How long a worker reuses its in-memory index before re-reading the shared cache
+INDEX_MEMO_SECONDS = 10 * 60
+
+_ROSTER_FIELDS = (
+    "people,id,fullName,firstName,lastName,useName,nickName,primaryNumber,"
+    "currentTeam,primaryPosition,abbreviation,active"
+)
+
+FUZZY_CUTOFF = 0.8
+MAX_MATCHES = 5
+
+# season -> (built_at, index)
+_indexes: Dict[int, Tuple[float, "PlayerIndex"]] = {}
+
+
+@dataclass
+class PlayerInfo:
+    player_id: int
+    name: str
+    team_id: Optional[int]
+    team_name: Optional[str]
+    position: Optional[str]
+    number: Optional[str]
+    active: bool
+    nickname: Optional[str] = None
+
+    @property
+    def is_pitcher(self) -> bool:
+        return self.position in ("P", "TWP")
+
+    @property
+    def is_hitter(self) -> bool:
+        return self.position != "P"
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case, accent-free, punctuation-free form used as an index key ("Acuña Jr." -> "acuna jr")."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_only = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in ascii_only.lower())
+    return " ".join(cleaned.split())
+
+
+class PlayerIndex:
+    """Name index over one season's players: exact, prefix and fuzzy lookup."""
+
+    def __init__(self, players: List[PlayerInfo]) -> None:
+        self.players = players
+        self.by_id: Dict[int, PlayerInfo] = {p.player_id: p for p in players}
+        # Normalized key -> indexes into `players`; keys are full names, nicknames and single name tokens
+        self._keys: Dict[str, List[int]] = {}
+        for i, p in enumerate(players):
+            for key in self._aliases(p):
+                bucket = self._keys.setdefault(key, [])
+                if not bucket or bucket[-1] != i:
+                    bucket.append(i)
+        self._sorted_keys = sorted(self._keys)
+
+    @staticmethod
+    def _aliases(p: PlayerInfo) -> List[str]:
+        full = normalize_name(p.name)
+        aliases = [full, *full.split(), normalize_name(p.nickname or "")]
+        return list(dict.fromkeys(a for a in aliases if a))
+
+    def _rank(self, idxs: List[int], team_id: Optional[int]) -> List[PlayerInfo]:
+        players = [self.players[i] for i in dict.fromkeys(idxs)]
+        if team_id is not None:
+            players = [p for p in players if p.team_id == team_id]
+        # Active players first, then by name for a stable order
+        return sorted(players, key=lambda p: (not p.active, p.name))
+
+    def lookup(self, query: str, team_id: Optional[int] = None) -> List[PlayerInfo]:
+        """Best matches for `query`: exact name/token, else name prefix, else fuzzy."""
+        q = normalize_name(query)
+        if not q:
+            return []
+        exact = self._rank(self._keys.get(q, []), team_id)
+        if exact:
+            return exact[:MAX_MATCHES]
+
+        lo = bisect.bisect_left(self._sorted_keys, q)
+        hi = bisect.bisect_right(self._sorted_keys, q + "\uffff")
+        prefixed = self._rank([i for k in self._sorted_keys[lo:hi] for i in self._keys[k]], team_id)
+        if prefixed:
+            return prefixed[:MAX_MATCHES]
+
+        close = difflib.get_close_matches(q, self._sorted_keys, n=MAX_MATCHES * 2, cutoff=FUZZY_CUTOFF)
+        # get_close_matches returns best first; keep that order across keys
+        fuzzy: List[PlayerInfo] = []
+        for key in close:
+            for p in self._rank(self._keys[key], team_id):
+                if p not in fuzzy:
+                    fuzzy.append(p)
+        return fuzzy[:MAX_MATCHES]
+
+
+def _season_ttl(season: int, ttl: int) -> int:
+    return COMPLETED_SEASON_TTL if is_completed_season(season) else ttl
+
+
+def fetch_players(season: int) -> List[dict]:
+    """All players of a season from the bulk `/sports/1/players` endpoint (trimmed to index fields)."""
+
+    ttl = _season_ttl(season, ROSTER_TTL)
+
+    def fetch() -> List[dict]:
+        params = {"season": season, "fields": _ROSTER_FIELDS}
+        data = get_json(get_session(), f"{STATS_API}/sports/1/players", params=params, timeout=30, ttl=ttl) or {}
+        return data.get("people", [])
+
+    return get_shared_cache().get_or_load("mlb_players", str(season), ttl, fetch, store_if=bool)
+
+
+def get_player_index(season: int) -> PlayerIndex:
+    now = time.time()
+    cached = _indexes.get(season)
+    if cached is not None and now - cached[0] < INDEX_MEMO_SECONDS:
+        return cached[1]
+    team_names = {t.get("id"): t.get("name") for t in load_teams()}
+    players: List[PlayerInfo] = []
+    for raw in fetch_players(season):
+        pid = raw.get("id")
+        name = raw.get("fullName")
+        if not pid or not name:
+            continue
+        team_id = (raw.get("currentTeam") or {}).get("id")
+        players.append(
+            PlayerInfo(
+                player_id=pid,
+                name=name,
+                team_id=team_id,
+                team_name=team_names.get(team_id),
+                position=(raw.get("primaryPosition") or {}).get("abbreviation"),
+                number=raw.get("primaryNumber"),
+                active=bool(raw.get("active")),
+                nickname=raw.get("nickName"),
+            )
+        )
+    index = PlayerIndex(players)
+    _indexes[season] = (now, index)
+    return index
+
+
+def fetch_player_stats(season: int, group: str) -> Dict[str, dict]:
+    """{player id (str): season stat line} for every player with stats in `group`, from one league call."""
+
+    ttl = _season_ttl(season, PLAYER_STATS_TTL)
+
+    def fetch() -> Dict[str, dict]:
+        params = {
+            "stats": "season",
+            "group": group,
+            "season": season,
+            "sportId": 1,
+            "playerPool": "ALL",
+            "limit": 5000,
+        }
+        data = get_json(get_session(), f"{STATS_API}/stats", params=params, timeout=30, ttl=ttl) or {}
+        out: Dict[str, dict] = {}
+        for block in data.get("stats") or []:
+            for sp in block.get("splits") or []:
+                pid = (sp.get("player") or {}).get("id")
+                stat = sp.get("stat")
+                if not pid or not stat:
+                    continue
+                # Traded players can have per-team splits; the combined line has no team
+                if str(pid) not in out or not sp.get("team"):
+                    out[str(pid)] = stat
+        return out
+
+    return get_shared_cache().get_or_load("mlb_player_stats", make_key(season, group), ttl, fetch)
+
+
+@traced
+def find_players(query: str, season: Optional[int] = None, team_id: Optional[int] = None) -> List[PlayerInfo]:
+    season = season or datetime.now().year
+    return get_player_index(season).lookup(query, team_id)
+
+
+@traced
+def get_player_stats(player: PlayerInfo, season: int, groups: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Season stat lines of one player, keyed by group; groups default to the player's position."""
+    if groups is None:
+        groups = [g for g, wanted in (("hitting", player.is_hitter), ("pitching", player.is_pitcher)) if wanted]
+    out: Dict[str, dict] = {}
+    for group in groups:
+        stat = fetch_player_stats(season, group).get(str(player.player_id))
+        if stat:
+            out[group] = stat
+    return out
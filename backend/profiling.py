@@ -0,0 +1,302 @@
+"""Opt-in per-request profiling for the /tools routes.
+
+A request is profiled when it carries `x-profile: 1` together with a valid
+tool token, or when it is picked by `PROFILE_SAMPLE_RATE` (0..1, default off).
+While a profile is active a background thread samples the stacks of the
+threads running that request every `SAMPLE_INTERVAL` seconds. `span(name)`
+blocks and `@traced` service functions record wall-clock spans; a thread is
+sampled while it is inside a span, and its open span names prefix the sampled
+stacks, so a flame graph separates upstream waits from parsing and
+serialization.
+
+Finished profiles are kept in a ring buffer of the last `MAX_PROFILES` and
+exported as speedscope JSON or collapsed stacks (`flamegraph.pl` input).
+
+When no profile is active the cost is one header lookup per /tools request
+and one context-variable read per span.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.005
+MAX_PROFILES = 20
+MAX_STACK_DEPTH = 64
+
+_current: contextvars.ContextVar[Optional["Profile"]] = contextvars.ContextVar("profile", default=None)
+
+
+class Profile:
+    def __init__(self, path: str, reason: str) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.path = path
+        self.reason = reason
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status: Optional[int] = None
+        # Stack tuples (root first) -> sample count
+        self.samples: Counter = Counter()
+        # (thread id, name, start, end) relative to t0, in completion order
+        self.spans: List[Tuple[int, str, float, float]] = []
+        # Thread id -> names of the spans currently open on it
+        self.open_spans: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "path": self.path,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "status": self.status,
+            "samples": sum(self.samples.values()),
+            "spans": len(self.spans),
+        }
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common())
+
+    def speedscope(self) -> dict:
+        frames: List[dict] = []
+        index: Dict[str, int] = {}
+
+        def frame(name: str) -> int:
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(frames)
+                frames.append({"name": name})
+            return i
+
+        stacks = list(self.samples.items())
+        end_ms = (self.duration or 0) * 1000
+        sampled = {
+            "type": "sampled",
+            "name": f"{self.path} (samples)",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": end_ms,
+            "samples": [[frame(n) for n in stack] for stack, _ in stacks],
+            "weights": [count * SAMPLE_INTERVAL * 1000 for _, count in stacks],
+        }
+        # Spans nest (per thread); replay them as properly nested open/close events
+        events: List[dict] = []
+        open_spans: List[Tuple[int, float]] = []
+        for _, name, start, end in sorted(self.spans, key=lambda s: (s[2], -s[3])):
+            while open_spans and open_spans[-1][1] <= start:
+                f, at = open_spans.pop()
+                events.append({"type": "C", "frame": f, "at": at * 1000})
+            events.append({"type": "O", "frame": frame(name), "at": start * 1000})
+            open_spans.append((frame(name), end))
+        while open_spans:
+            f, at = open_spans.pop()
+            events.append({"type": "C", "frame": f, "at": at * 1000})
+        spans = {
+            "type": "evented",
+            "name": f"{self.path} (spans)",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": end_ms,
+            "events": events,
+        }
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.path} {self.id}",
+            "exporter": "mlb-tools-backend",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [sampled, spans],
+        }
+
+
+class _Span:
+    __slots__ = ("profile", "name", "ident", "start")
+
+    def __init__(self, profile: Profile, name: str) -> None:
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.ident = threading.get_ident()
+        with self.profile._lock:
+            self.profile.open_spans.setdefault(self.ident, []).append(self.name)
+        self.start = time.perf_counter() - self.profile.t0
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter() - self.profile.t0
+        with self.profile._lock:
+            stack = self.profile.open_spans[self.ident]
+            stack.pop()
+            if not stack:
+                # Thread leaves the request; stop sampling it
+                del self.profile.open_spans[self.ident]
+            self.profile.spans.append((self.ident, self.name, self.start, end))
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Context manager marking a named section of the current request's profile (no-op when off)."""
+    profile = _current.get()
+    if profile is None:
+        return _NO_SPAN
+    return _Span(profile, name)
+
+
+def traced(fn):
+    """Decorator running `fn` inside a span named after it."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return fn(*args, **kwargs)
+        with _Span(profile, name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"
+
+
+class _Sampler:
+    """One background thread sampling the span-registered threads of all active profiles."""
+
+    def __init__(self) -> None:
+        self.active: List[Profile] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: Profile) -> None:
+        with self._cond:
+            self.active.append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def remove(self, profile: Profile) -> None:
+        with self._cond:
+            self.active.remove(profile)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self.active:
+                    self._cond.wait()
+                profiles = list(self.active)
+            frames = sys._current_frames()
+            for profile in profiles:
+                with profile._lock:
+                    threads = [(ident, list(names)) for ident, names in profile.open_spans.items()]
+                for ident, names in threads:
+                    frame = frames.get(ident)
+                    if frame is None:
+                        continue
+                    stack: List[str] = []
+                    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                        stack.append(_frame_name(frame))
+                        frame = frame.f_back
+                    stack.reverse()
+                    profile.samples[tuple(f"[{n}]" for n in names) + tuple(stack)] += 1
+            del frames
+            time.sleep(SAMPLE_INTERVAL)
+
+
+_sampler = _Sampler()
+_profiles: Deque[Profile] = deque(maxlen=MAX_PROFILES)
+
+
+def recent_profiles() -> List[dict]:
+    return [p.summary() for p in reversed(_profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[Profile]:
+    for p in _profiles:
+        if p.id == profile_id:
+            return p
+    return None
+
+
+def _sample_rate() -> float:
+    try:
+        return float(settings.PROFILE_SAMPLE_RATE or 0)
+    except ValueError:
+        logger.warning("Invalid PROFILE_SAMPLE_RATE %r; profiling sampling disabled", settings.PROFILE_SAMPLE_RATE)
+        return 0.0
+
+
+class ProfilingMiddleware:
+    """ASGI middleware starting a profile for opted-in /tools requests."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.sample_rate = _sample_rate()
+
+    def _reason(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"x-profile") == b"1":
+            expected = settings.TOOL_TOKEN
+            token = (headers.get(b"x-tool-token") or b"").decode("latin-1")
+            if not expected or token == expected:
+                return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope.get("path", "").startswith("/tools/"):
+            await self.app(scope, receive, send)
+            return
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope["path"], reason)
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message = {**message, "headers": [*(message.get("headers") or []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        token = _current.set(profile)
+        _sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _sampler.remove(profile)
+            _current.reset(token)
+            profile.duration = time.perf_counter() - profile.t0
+            _profiles.append(profile)
+            logger.info("Profiled %s (%s): %.1f ms, id %s", profile.path, reason, profile.duration * 1000, profile.id)
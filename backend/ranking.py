@@ -0,0 +1,137 @@
+"""Result processing for news and video lists: near-duplicate collapsing and ranking.
+
+Each item gets a 64-bit SimHash of its title + description. Candidate
+duplicates are found by LSH banding (8 bands of 8 bits: any two fingerprints
+within `MAX_HAMMING` bits share at least one band), so collapsing is roughly
+linear in the number of items instead of all-pairs.
+
+Items are ranked by a weighted score of recency, source weight, popularity
+(when known) and team relevance, then collapsed best-first, so the first
+`limit` results are all distinct.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+MAX_HAMMING = 7
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+RECENCY_HALF_LIFE_HOURS = 48.0
+
+# Relative trust of outlets/channels (lower-cased names); anything else gets DEFAULT_SOURCE_WEIGHT
+SOURCE_WEIGHTS: Dict[str, float] = {
+    "mlb.com": 1.0,
+    "mlb": 1.0,
+    "associated press": 0.95,
+    "espn": 0.95,
+    "the athletic": 0.95,
+    "the new york times": 0.9,
+    "cbs sports": 0.85,
+    "fox sports": 0.85,
+    "yahoo sports": 0.8,
+    "sports illustrated": 0.8,
+    "usa today": 0.8,
+    "bleacher report": 0.7,
+}
+DEFAULT_SOURCE_WEIGHT = 0.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams."""
+    toks = _tokens(text)
+    features = toks + [f"{a} {b}" for a, b in zip(toks, toks[1:])]
+    if not features:
+        return 0
+    hashes = [
+        format(int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+        for f in features
+    ]
+    # Column-wise majority vote over the bit strings (counted in C via tuple.count)
+    half = len(hashes) / 2
+    bits = "".join("1" if col.count("1") > half else "0" for col in zip(*hashes))
+    return int(bits, 2)
+
+
+def collapse_near_duplicates(items: Sequence[T], texts: Sequence[str]) -> List[T]:
+    """Keep the first item of every near-duplicate group (input order = priority)."""
+    kept: List[T] = []
+    kept_hashes: List[int] = []
+    buckets: Dict[tuple, List[int]] = {}
+    for item, text in zip(items, texts):
+        h = simhash(text)
+        bands = [(b, (h >> (b * _BAND_BITS)) & _BAND_MASK) for b in range(_BANDS)]
+        candidates = {i for band in bands for i in buckets.get(band, ())}
+        if any(bin(h ^ kept_hashes[i]).count("1") <= MAX_HAMMING for i in candidates):
+            continue
+        idx = len(kept)
+        kept.append(item)
+        kept_hashes.append(h)
+        for band in bands:
+            buckets.setdefault(band, []).append(idx)
+    return kept
+
+
+def _recency(published: Optional[datetime], now: datetime) -> float:
+    if published is None:
+        return 0.5
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    age_hours = max(0.0, (now - published).total_seconds() / 3600)
+    return 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+
+
+def _relevance(title: str, body: str, terms: Sequence[str]) -> float:
+    if not terms:
+        return 0.0
+    title_l, body_l = title.lower(), body.lower()
+    if any(t.lower() in title_l for t in terms):
+        return 1.0
+    if any(t.lower() in body_l for t in terms):
+        return 0.6
+    return 0.0
+
+
+def _popularity(count: Optional[int]) -> float:
+    # log scale: 10M views ~ 1.0
+    return min(1.0, math.log10(count + 1) / 7) if count else 0.0
+
+
+def rank_distinct(
+    items: Sequence[T],
+    *,
+    title: Callable[[T], str],
+    body: Callable[[T], str],
+    published_at: Callable[[T], Optional[datetime]],
+    source: Callable[[T], Optional[str]],
+    terms: Sequence[str],
+    limit: int,
+    popularity: Optional[Callable[[T], Optional[int]]] = None,
+) -> List[T]:
+    """Score, collapse near-duplicates and return the top `limit` distinct items."""
+    now = datetime.now(timezone.utc)
+
+    def score(item: T) -> float:
+        s = 0.4 * _recency(published_at(item), now)
+        s += 0.2 * SOURCE_WEIGHTS.get((source(item) or "").lower(), DEFAULT_SOURCE_WEIGHT)
+        s += 0.25 * _relevance(title(item), body(item), terms)
+        if popularity is not None:
+            s += 0.15 * _popularity(popularity(item))
+        return s
+
+    ranked = sorted(items, key=score, reverse=True)
+    distinct = collapse_near_duplicates(ranked, [f"{title(i)} {body(i)}" for i in ranked])
+    return distinct[:limit]
@@ -0,0 +1,253 @@
+"""Offline season data packs.
+
+A pack holds one completed season (the league `GameTable` plus team
+hitting/pitching stats) in a compact columnar file that is memory-mapped on
+first use, so historical lookups in `mlb_service` never touch the network.
+
+Build packs with:
+
+    python season_pack.py 2022 2023 [--dir DIR]
+
+File layout: 8-byte magic, uint32 header length, JSON header, then 8-byte
+aligned column blocks in native byte order. The header lists each column as
+[typecode, offset, count] (offset relative to the first column block) plus
+the string table that the name/venue/status columns index into.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from config import settings
+from game_table import GAME_COLUMNS, GameTable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MLBPACK1"
+FORMAT_VERSION = 3
+STAT_GROUPS = ("hitting", "pitching")
+
+
+def pack_path(season: int, directory: str | None = None) -> str:
+    return os.path.join(directory or settings.SEASON_PACK_DIR, f"season_{season}.pack")
+
+
+def _data_start(header_len: int) -> int:
+    start = 12 + header_len
+    return start + (-start) % 8
+
+
+def is_completed_season(season: int) -> bool:
+    return season < date.today().year
+
+
+class SeasonPack:
+    """Read-only view over a memory-mapped season pack."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"{path} is not a season pack")
+        (header_len,) = struct.unpack_from("<I", self._mm, 8)
+        header = json.loads(self._mm[12 : 12 + header_len].decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path} was built with an incompatible format")
+        self.season: int = header["season"]
+        self._data_start = _data_start(header_len)
+        self._view = memoryview(self._mm)
+        self.games = GameTable(
+            self.season,
+            {name: self._column(spec) for name, spec in header["games"].items()},
+            header["strings"],
+        )
+        self._stats: Dict[str, dict] = {}
+        for group, spec in header["stats"].items():
+            self._stats[group] = {
+                "fields": spec["fields"],
+                "int_fields": set(spec["int_fields"]),
+                "row_of": {tid: i for i, tid in enumerate(self._column(spec["team_ids"]))},
+                "values": self._column(spec["values"]),
+            }
+
+    def _column(self, spec: list) -> memoryview:
+        typecode, offset, count = spec
+        start = self._data_start + offset
+        return self._view[start : start + array(typecode).itemsize * count].cast(typecode)
+
+    def team_stats(self, team_id: int) -> dict:
+        """Return {"season", "hitting", "pitching"} for the team (numeric stats only)."""
+        out: dict = {"season": self.season}
+        for group, st in self._stats.items():
+            row = st["row_of"].get(team_id)
+            if row is None:
+                continue
+            fields = st["fields"]
+            base = row * len(fields)
+            stat: dict = {}
+            for j, name in enumerate(fields):
+                v = st["values"][base + j]
+                if math.isnan(v):
+                    continue
+                stat[name] = int(v) if name in st["int_fields"] else v
+            out[group] = stat
+        return out
+
+
+_packs: Dict[int, Optional[SeasonPack]] = {}
+_packs_lock = threading.Lock()
+
+
+def load_season_pack(season: int) -> Optional[SeasonPack]:
+    """Return the pack for a completed season, or None when none has been built."""
+    if season in _packs:
+        return _packs[season]
+    with _packs_lock:
+        if season not in _packs:
+            pack: Optional[SeasonPack] = None
+            path = pack_path(season)
+            if is_completed_season(season) and os.path.exists(path):
+                try:
+                    pack = SeasonPack(path)
+                except (OSError, ValueError) as e:
+                    logger.warning("Ignoring season pack %s: %s", path, e)
+            _packs[season] = pack
+    return _packs[season]
+
+
+def _to_number(v) -> Optional[float]:
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, str):
+        try:
+            return float(v)
+        except ValueError:
+            return None
+    return None
+
+
+def write_season_pack(season: int, schedule: dict, league_stats: dict, path: str) -> int:
+    """Encode raw statsapi `/schedule` and `/teams/stats` payloads into a pack file.
+
+    Returns the number of games written. The file is replaced atomically.
+    """
+    table = GameTable.from_schedule(season, schedule)
+
+    blocks: List[bytes] = []
+    offset = 0
+
+    def add_block(typecode: str, values) -> list:
+        nonlocal offset
+        arr = array(typecode, values)
+        data = arr.tobytes()
+        pad = (-len(data)) % 8
+        blocks.append(data + b"\0" * pad)
+        spec = [typecode, offset, len(arr)]
+        offset += len(data) + pad
+        return spec
+
+    games_header = {name: add_block(typecode, table.columns[name]) for name, typecode in GAME_COLUMNS}
+
+    stats_header: dict = {}
+    for r in (league_stats.get("stats") or []):
+        group = ((r.get("group") or {}).get("displayName") or "").lower()
+        if group not in STAT_GROUPS:
+            continue
+        splits = [sp for sp in (r.get("splits") or []) if (sp.get("team") or {}).get("id")]
+        fields: List[str] = []
+        int_fields: List[str] = []
+        for sp in splits:
+            for name, v in (sp.get("stat") or {}).items():
+                if name not in fields and _to_number(v) is not None:
+                    fields.append(name)
+        for name in fields:
+            if all(isinstance((sp.get("stat") or {}).get(name, 0), int) for sp in splits):
+                int_fields.append(name)
+        values: List[float] = []
+        for sp in splits:
+            st = sp.get("stat") or {}
+            for name in fields:
+                n = _to_number(st.get(name))
+                values.append(math.nan if n is None else n)
+        stats_header[group] = {
+            "fields": fields,
+            "int_fields": int_fields,
+            "team_ids": add_block("i", [sp["team"]["id"] for sp in splits]),
+            "values": add_block("d", values),
+        }
+
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "season": season,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "strings": table.strings,
+        "games": games_header,
+        "stats": stats_header,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - 12 - len(header_bytes)))
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp, path)
+    return len(table)
+
+
+def build_season_pack(season: int, directory: str | None = None, force: bool = False) -> str:
+    """Download a completed season through `mlb_service` and write its pack."""
+    import mlb_service  # local import: mlb_service reads packs through this module
+
+    if not force and not is_completed_season(season):
+        raise ValueError(f"Season {season} is not complete yet; pass force=True to snapshot it anyway")
+    schedule = mlb_service.fetch_season_schedule(season)
+    league_stats = mlb_service.fetch_league_stats(season)
+    path = pack_path(season, directory)
+    n_games = write_season_pack(season, schedule, league_stats, path)
+    _packs.pop(season, None)
+    logger.info("Wrote %s (%d games, %d bytes)", path, n_games, os.path.getsize(path))
+    return path
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build offline MLB season data packs.")
+    parser.add_argument("seasons", nargs="+", type=int, help="Completed seasons to download, e.g. 2022 2023")
+    parser.add_argument("--dir", default=None, help="Output directory (default: SEASON_PACK_DIR)")
+    parser.add_argument("--force", action="store_true", help="Allow snapshotting a season that is still in progress")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    status = 0
+    for season in args.seasons:
+        try:
+            build_season_pack(season, args.dir, force=args.force)
+        except Exception as e:
+            logger.error("Season %d failed: %s", season, e)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expired entries are kept this long so a worker can serve stale data while
+# another worker refreshes it (or while upstream is failing).
+STALE_GRACE_SECONDS = 24 * 3600
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )
+    """,
+)
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts."""
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class SharedCache:
+    """Cross-process cache shared by every worker on one host.
+
+    Entries live in a local SQLite file in WAL mode, so readers never block the
+    writer and every write is a single atomic transaction. Refreshes follow a
+    single-writer protocol: the worker that takes the lease for a key calls
+    upstream, the others serve the stale copy or wait briefly for the result.
+    If the file cannot be opened the cache degrades to calling loaders directly.
+    """
+
+    # Must outlive the slowest loader (the season schedule allows a 60 s upstream timeout):
+    # waiters only take over a refresh once its lease has expired
+    def __init__(self, path: str, lease_seconds: float = 90.0) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._disabled = False
+        self._writes = 0
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork (uvicorn workers are forked)
+        if conn is not None and getattr(self._local, "pid", None) == pid:
+            return conn
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Shared cache unavailable at %s: %s", self.path, e)
+            self._disabled = True
+            return None
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    def available(self) -> bool:
+        """False once the cache file could not be opened (every read misses, every write is dropped)."""
+        return self._conn() is not None
+
+    def _owner(self) -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Any, bool]]:
+        """Return (value, is_fresh), including stale entries within the grace period."""
+        conn = self._conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Shared cache read failed: %s", e)
+            return None
+        if not row:
+            return None
+        now = time.time()
+        if row[1] + STALE_GRACE_SECONDS < now:
+            return None
+        return json.loads(row[0]), row[1] > now
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self.get_entry(namespace, key)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        conn = self._conn()
+        if conn is None:
+            return
+        payload = json.dumps(value, separators=(",", ":"), default=str)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, payload, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % 500 == 0:
+                self.purge()
+        except sqlite3.Error as e:
+            logger.debug("Shared cache write failed: %s", e)
+
+    def delete(self, namespace: str, key: str) -> None:
+        conn = self._conn()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error as e:
+            logger.debug("Shared cache delete failed: %s", e)
+
+    def purge(self) -> None:
+        """Drop entries past the stale grace period and abandoned leases."""
+        conn = self._conn()
+        if conn is None:
+            return
+        now = time.time()
+        try:
+            conn.execute("DELETE FROM entries WHERE expires_at < ?", (now - STALE_GRACE_SECONDS,))
+            conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+        except sqlite3.Error as e:
+            logger.debug("Shared cache purge failed: %s", e)
+
+    def _acquire_lease(self, namespace: str, key: str) -> bool:
+        conn = self._conn()
+        if conn is None:
+            return True
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT expires_at FROM leases WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()
+                if row and row[0] > now:
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, self._owner(), now + self.lease_seconds),
+                )
+                return True
+            finally:
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.debug("Shared cache lease failed: %s", e)
+            return True
+
+    def _release_lease(self, namespace: str, key: str) -> None:
+        conn = self._conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "DELETE FROM leases WHERE namespace = ? AND key = ? AND owner = ?",
+                (namespace, key, self._owner()),
+            )
+        except sqlite3.Error as e:
+            logger.debug("Shared cache lease release failed: %s", e)
+
+    def _lease_held(self, namespace: str, key: str) -> bool:
+        conn = self._conn()
+        if conn is None:
+            return False
+        try:
+            row = conn.execute(
+                "SELECT expires_at FROM leases WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        except sqlite3.Error:
+            return False
+        return bool(row and row[0] > time.time())
+
+    def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Any],
+        store_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for `key`, refreshing it through `loader` when expired.
+
+        Only the lease holder calls `loader`; other workers get the stale value if
+        one exists, otherwise they wait for the holder's result. The holder stores
+        the value before releasing the lease. If it fails (or `store_if` vetoes the
+        value) or its lease expires, the next waiter takes the lease and loads, so
+        upstream is never called by two workers at once. If the refresh fails and a
+        stale value exists, the stale value is returned.
+        `store_if` can veto caching a loaded value (e.g. a degraded empty result).
+        """
+        entry = self.get_entry(namespace, key)
+        if entry is not None and entry[1]:
+            return entry[0]
+
+        while True:
+            if self._acquire_lease(namespace, key):
+                try:
+                    value = loader()
+                    if store_if is None or store_if(value):
+                        self.set(namespace, key, value, ttl)
+                except Exception:
+                    if entry is not None:
+                        logger.warning("Refresh of %s/%s failed; serving stale value", namespace, key)
+                        return entry[0]
+                    raise
+                finally:
+                    self._release_lease(namespace, key)
+                return value
+
+            if entry is not None:
+                return entry[0]
+
+            while self._lease_held(namespace, key):
+                time.sleep(0.05)
+                fresh = self.get(namespace, key)
+                if fresh is not None:
+                    return fresh
+            fresh = self.get(namespace, key)
+            if fresh is not None:
+                return fresh
+            # The holder released without storing or its lease expired; try to take over
+
+
+_shared_cache: SharedCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(settings.CACHE_PATH)
+    return _shared_cache
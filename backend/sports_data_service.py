@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Optional, Dict
 
 from news_service import NewsService, NewsArticle, get_team_search_terms
+from profiling import traced
 from youtube_service import search_videos, VideoItem
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class SportsDataService:
     def __init__(self) -> None:
         self.news_service = NewsService()
 
+    @traced
     def get_team_intelligence(
         self,
         team_name: str,
@@ -42,7 +44,7 @@ class SportsDataService:
         news_articles = self.news_service.search_team_news(primary_term, days_back, max_news)
 
         youtube_query = f"{primary_term} MLB baseball highlights analysis"
-        youtube_videos = search_videos(youtube_query, max_videos)
+        youtube_videos = search_videos(youtube_query, max_videos, team=primary_term)
 
         return TeamIntelligence(
             team_name=primary_term,
@@ -58,6 +60,8 @@ class SportsDataService:
         days_back: int = 7,
     ) -> Dict[str, TeamIntelligence]:
         logger.info("Analyzing matchup: %s vs %s", team1, team2)
+        # One combined NewsAPI query for both teams; get_team_intelligence reads it from the cache
+        self.news_service.search_many_teams([team1, team2], days_back)
         return {
             team1: self.get_team_intelligence(team1, days_back),
             team2: self.get_team_intelligence(team2, days_back),
@@ -68,35 +72,8 @@ class SportsDataService:
         summary_parts.append(f"# Intelligence Report: {intelligence.team_name}")
         summary_parts.append(f"Generated: {intelligence.generated_at.strftime('%Y-%m-%d %H:%M')}")
         summary_parts.append("")
-
-        summary_parts.append("## Recent News Articles")
-        if intelligence.news_articles:
-            for i, article in enumerate(intelligence.news_articles[:5], 1):
-                summary_parts.append(f"{i}. **{article.title}**")
-                summary_parts.append(f"   Source: {article.source}")
-                summary_parts.append(f"   Published: {article.published_at.strftime('%Y-%m-%d')}")
-                if article.description:
-                    summary_parts.append(f"   Summary: {article.description[:150]}...")
-                summary_parts.append(f"   Link: {article.url}")
-                summary_parts.append("")
-        else:
-            summary_parts.append("No recent news articles found.")
-            summary_parts.append("")
-
-        summary_parts.append("## Recent YouTube Videos")
-        if intelligence.youtube_videos:
-            for i, video in enumerate(intelligence.youtube_videos[:5], 1):
-                summary_parts.append(f"{i}. **{video.title}**")
-                if video.channel:
-                    summary_parts.append(f"   Channel: {video.channel}")
-                if video.view_count:
-                    summary_parts.append(f"   Views: {video.view_count:,}")
-                summary_parts.append(f"   Link: {video.url}")
-                summary_parts.append("")
-        else:
-            summary_parts.append("No recent videos found.")
-            summary_parts.append("")
-
+        summary_parts.extend(render_news_section(news_section_inputs(intelligence)))
+        summary_parts.extend(render_video_section(video_section_inputs(intelligence)))
         return "\n".join(summary_parts)
 
     def generate_matchup_summary(self, matchup_data: Dict[str, TeamIntelligence]) -> str:
@@ -104,35 +81,93 @@ class SportsDataService:
         if len(teams) != 2:
             return "Invalid matchup data - need exactly 2 teams"
         team1, team2 = teams
-        intel1, intel2 = matchup_data[team1], matchup_data[team2]
 
         summary_parts: List[str] = []
         summary_parts.append(f"# Strategic Matchup Analysis: {team1} vs {team2}")
         summary_parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         summary_parts.append("")
+        for team in teams:
+            summary_parts.extend(render_matchup_team_section(matchup_team_inputs(team, matchup_data[team])))
+        summary_parts.extend(MATCHUP_NOTES)
+        return "\n".join(summary_parts)
 
-        summary_parts.append(f"## {team1} Intelligence")
-        summary_parts.append(f"- Recent news articles: {len(intel1.news_articles)}")
-        summary_parts.append(f"- Recent videos: {len(intel1.youtube_videos)}")
-        if intel1.news_articles:
-            summary_parts.append("### Top Headlines:")
-            for article in intel1.news_articles[:3]:
-                summary_parts.append(f"- {article.title} ({article.source})")
-        summary_parts.append("")
-
-        summary_parts.append(f"## {team2} Intelligence")
-        summary_parts.append(f"- Recent news articles: {len(intel2.news_articles)}")
-        summary_parts.append(f"- Recent videos: {len(intel2.youtube_videos)}")
-        if intel2.news_articles:
-            summary_parts.append("### Top Headlines:")
-            for article in intel2.news_articles[:3]:
-                summary_parts.append(f"- {article.title} ({article.source})")
-        summary_parts.append("")
-
-        summary_parts.append("## Strategic Notes")
-        summary_parts.append("- Review recent performance trends in the articles above")
-        summary_parts.append("- Check video analysis for tactical insights")
-        summary_parts.append("- Look for injury reports or roster changes")
-        summary_parts.append("- Analyze recent game outcomes and patterns")
 
-        return "\n".join(summary_parts)
+# Report sections. Each section renders only from its `*_inputs`, so a stored
+# section can be reused while its inputs are unchanged (see summary_store.py).
+
+def news_section_inputs(intelligence: TeamIntelligence) -> list:
+    return [
+        [a.title, a.source, a.published_at.strftime('%Y-%m-%d'), (a.description or "")[:150], a.url]
+        for a in intelligence.news_articles[:5]
+    ]
+
+
+def render_news_section(items: list) -> List[str]:
+    lines = ["## Recent News Articles"]
+    if items:
+        for i, (title, source, published, description, url) in enumerate(items, 1):
+            lines.append(f"{i}. **{title}**")
+            lines.append(f"   Source: {source}")
+            lines.append(f"   Published: {published}")
+            if description:
+                lines.append(f"   Summary: {description}...")
+            lines.append(f"   Link: {url}")
+            lines.append("")
+    else:
+        lines.append("No recent news articles found.")
+        lines.append("")
+    return lines
+
+
+def video_section_inputs(intelligence: TeamIntelligence) -> list:
+    return [[v.title, v.channel, v.view_count, v.url] for v in intelligence.youtube_videos[:5]]
+
+
+def render_video_section(items: list) -> List[str]:
+    lines = ["## Recent YouTube Videos"]
+    if items:
+        for i, (title, channel, view_count, url) in enumerate(items, 1):
+            lines.append(f"{i}. **{title}**")
+            if channel:
+                lines.append(f"   Channel: {channel}")
+            if view_count:
+                lines.append(f"   Views: {view_count:,}")
+            lines.append(f"   Link: {url}")
+            lines.append("")
+    else:
+        lines.append("No recent videos found.")
+        lines.append("")
+    return lines
+
+
+def matchup_team_inputs(team: str, intelligence: TeamIntelligence) -> list:
+    return [
+        team,
+        len(intelligence.news_articles),
+        len(intelligence.youtube_videos),
+        [[a.title, a.source] for a in intelligence.news_articles[:3]],
+    ]
+
+
+def render_matchup_team_section(inputs: list) -> List[str]:
+    team, n_news, n_videos, headlines = inputs
+    lines = [
+        f"## {team} Intelligence",
+        f"- Recent news articles: {n_news}",
+        f"- Recent videos: {n_videos}",
+    ]
+    if headlines:
+        lines.append("### Top Headlines:")
+        for title, source in headlines:
+            lines.append(f"- {title} ({source})")
+    lines.append("")
+    return lines
+
+
+MATCHUP_NOTES = [
+    "## Strategic Notes",
+    "- Review recent performance trends in the articles above",
+    "- Check video analysis for tactical insights",
+    "- Look for injury reports or roster changes",
+    "- Analyze recent game outcomes and patterns",
+]
@@ -0,0 +1,239 @@
+"""Precomputed intelligence reports, updated section by section.
+
+A report (one team, or a matchup of two) is stored in the shared cache as
+its rendered markdown plus, per section, the text and a fingerprint of the
+inputs it was rendered from. A refresh gathers fresh intelligence, re-renders
+only the sections whose fingerprint changed and reuses the rest; `updated_at`
+moves only when some section actually changed.
+
+`get_report` answers from the stored record at once. A missing record is
+built inline; a stale one is served as is while a `refresh_report` job
+brings it up to date. Subjects requested recently are also refreshed by a
+background thread, so repeat callers rarely see stale data.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import jobs
+from news_service import MLB_TEAM_ALIASES, find_team_key
+from profiling import traced
+from shared_cache import get_shared_cache, make_key
+from sports_data_service import (
+    MATCHUP_NOTES,
+    SportsDataService,
+    TeamIntelligence,
+    matchup_team_inputs,
+    news_section_inputs,
+    render_matchup_team_section,
+    render_news_section,
+    render_video_section,
+    video_section_inputs,
+)
+
+logger = logging.getLogger(__name__)
+
+REPORT_TTL = 24 * 3600
+# A finished refresh job dedupes identical submits for JOB_RESULT_TTL, so refreshing more often is a no-op
+REPORT_MAX_AGE = jobs.JOB_RESULT_TTL
+# Background refresh: how often to look, and how long a subject stays "recent" after a request
+REFRESH_INTERVAL = 60
+RECENT_WINDOW = 3600
+MAX_RECENT = 50
+# Refresh jobs pending at once, so a sweep leaves most of jobs.JOB_MAX_PENDING to user submissions
+REFRESH_MAX_PENDING = 8
+
+# subject -> last request time, oldest first
+_recent: "OrderedDict[Tuple, float]" = OrderedDict()
+_lock = threading.Lock()
+_refresher: Optional[threading.Thread] = None
+_refresh_slots = threading.BoundedSemaphore(REFRESH_MAX_PENDING)
+
+Section = Tuple[str, object, Callable[[object], List[str]]]
+
+
+def _fingerprint(inputs: object) -> str:
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _primary(team: str) -> str:
+    """Lower-cased primary alias of a team named exactly by key or alias; ValueError otherwise."""
+    key = find_team_key(team)
+    if key is None:
+        raise ValueError(f"Team not found for input: {team}")
+    return MLB_TEAM_ALIASES[key][0].lower()
+
+
+def _subject(team: str, opponent: Optional[str], days_back: int) -> Tuple:
+    if opponent:
+        # Sorted, so A vs B and B vs A share one report
+        return ("matchup", *sorted((_primary(team), _primary(opponent))), days_back)
+    return ("team", _primary(team), days_back)
+
+
+def _store(subject: Tuple, header: Callable[[float], List[str]], sections: List[Section]) -> dict:
+    cache = get_shared_cache()
+    key = make_key(*subject)
+    old = cache.get("summaries", key) or {}
+    old_sections = old.get("sections") or {}
+    now = time.time()
+
+    new_sections = {}
+    changed = []
+    for name, inputs, render in sections:
+        fp = _fingerprint(inputs)
+        prev = old_sections.get(name)
+        if prev is not None and prev["fp"] == fp:
+            new_sections[name] = prev
+        else:
+            new_sections[name] = {"fp": fp, "text": "\n".join(render(inputs))}
+            changed.append(name)
+
+    updated_at = now if changed or not old else old["updated_at"]
+    if changed or not old:
+        report = "\n".join([*header(updated_at), *(s["text"] for s in new_sections.values())])
+    else:
+        report = old["report"]
+    record = {
+        "subject": list(subject),
+        "sections": new_sections,
+        "changed": changed,
+        "report": report,
+        "updated_at": updated_at,
+        "refreshed_at": now,
+    }
+    cache.set("summaries", key, record, REPORT_TTL)
+    return record
+
+
+def _stamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M')
+
+
+def _store_team(intel: TeamIntelligence, days_back: int) -> dict:
+    return _store(
+        ("team", intel.team_name.lower(), days_back),
+        lambda ts: [f"# Intelligence Report: {intel.team_name}", f"Generated: {_stamp(ts)}", ""],
+        [
+            ("news", news_section_inputs(intel), render_news_section),
+            ("videos", video_section_inputs(intel), render_video_section),
+        ],
+    )
+
+
+@traced
+def refresh_team_report(team: str, days_back: int = 7) -> dict:
+    intel = SportsDataService().get_team_intelligence(team, days_back)
+    return _store_team(intel, days_back)
+
+
+@traced
+def refresh_matchup_report(team1: str, team2: str, days_back: int = 7) -> dict:
+    """Refresh the matchup report, and both team reports from the same intelligence."""
+    matchup = SportsDataService().get_opponent_analysis(team1, team2, days_back)
+    intel1, intel2 = sorted((matchup[team1], matchup[team2]), key=lambda i: i.team_name.lower())
+    for intel in (intel1, intel2):
+        _store_team(intel, days_back)
+    return _store(
+        ("matchup", intel1.team_name.lower(), intel2.team_name.lower(), days_back),
+        lambda ts: [
+            f"# Strategic Matchup Analysis: {intel1.team_name} vs {intel2.team_name}",
+            f"Generated: {_stamp(ts)}",
+            "",
+        ],
+        [
+            ("team1", matchup_team_inputs(intel1.team_name, intel1), render_matchup_team_section),
+            ("team2", matchup_team_inputs(intel2.team_name, intel2), render_matchup_team_section),
+            ("notes", None, lambda _: MATCHUP_NOTES),
+        ],
+    )
+
+
+def _refresh(subject: Tuple) -> dict:
+    if subject[0] == "matchup":
+        return refresh_matchup_report(subject[1], subject[2], subject[3])
+    return refresh_team_report(subject[1], subject[2])
+
+
+def _refresh_job(params: dict) -> dict:
+    try:
+        record = _refresh(tuple(params["subject"]))
+    finally:
+        _refresh_slots.release()
+    return {"updated_at": record["updated_at"], "changed": record["changed"]}
+
+
+jobs.register("refresh_report", _refresh_job)
+
+
+def _schedule_refresh(subject: Tuple) -> bool:
+    """Queue a refresh of `subject`; True if one is now pending."""
+    if not _refresh_slots.acquire(blocking=False):
+        logger.info("Report refresh for %s skipped: %d refreshes already pending", subject, REFRESH_MAX_PENDING)
+        return False
+    try:
+        job, deduplicated = jobs.submit("refresh_report", {"subject": list(subject)})
+    except (jobs.JobQueueFull, jobs.JobStoreUnavailable) as e:
+        _refresh_slots.release()
+        logger.info("Report refresh for %s skipped: %s", subject, type(e).__name__)
+        return False
+    if deduplicated:
+        # No new job runs, so nothing will release the slot
+        _refresh_slots.release()
+    return job["status"] in ("queued", "running")
+
+
+def _touch(subject: Tuple) -> None:
+    global _refresher
+    with _lock:
+        _recent[subject] = time.time()
+        _recent.move_to_end(subject)
+        while len(_recent) > MAX_RECENT:
+            _recent.popitem(last=False)
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, name="report-refresher", daemon=True)
+            _refresher.start()
+
+
+def _refresh_loop() -> None:
+    cache = get_shared_cache()
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        now = time.time()
+        with _lock:
+            while _recent and now - next(iter(_recent.values())) > RECENT_WINDOW:
+                _recent.popitem(last=False)
+            subjects = list(_recent)
+        for subject in subjects:
+            try:
+                record = cache.get("summaries", make_key(*subject))
+                if record is None or now - record["refreshed_at"] >= REPORT_MAX_AGE:
+                    _schedule_refresh(subject)
+            except Exception:
+                logger.exception("Background report refresh for %s failed", subject)
+
+
+def get_report(team: str, opponent: Optional[str] = None, days_back: int = 7) -> Tuple[dict, bool]:
+    """(stored report record, refresh pending). Builds inline only when nothing is stored yet.
+
+    Raises ValueError unless each name is exactly an MLB team key or alias, so
+    junk input never spends NewsAPI/YouTube quota or takes a background refresh slot.
+    """
+    subject = _subject(team, opponent, days_back)
+    _touch(subject)
+    record = get_shared_cache().get("summaries", make_key(*subject))
+    if record is None:
+        return _refresh(subject), False
+    refreshing = False
+    if time.time() - record["refreshed_at"] >= REPORT_MAX_AGE:
+        refreshing = _schedule_refresh(subject)
+    return record, refreshing
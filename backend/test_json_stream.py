@@ -0,0 +1,41 @@
+"""Regression tests for json_stream: every chunk split must parse like json.loads."""
+from __future__ import annotations
+
+import json
+
+from json_stream import iter_array_items, iter_text
+
+PAYLOAD = json.dumps({
+    "copyright": "games: [not an array]",
+    "dates": [
+        {"date": "2024-04-01", "games": [7, 8.5, -1.25e-3, 1E+2, 0, True, None, "é ✓", {"games": [1, 2]}, [3.0]]},
+        {"date": "2024-04-02", "games": []},
+        {"date": "2024-04-03", "games": [{"gamePk": 745001, "score": 12}, 3.14159]},
+    ],
+    "stats": [{"pct": ".500", "era": 3.75}, 42],
+}, indent=1, ensure_ascii=False).encode("utf-8")
+
+
+def _expected(key: str) -> list:
+    payload = json.loads(PAYLOAD)
+    if key == "games":
+        return [g for d in payload["dates"] for g in d["games"]]
+    return payload[key]
+
+
+def test_every_two_way_split_matches_json_loads():
+    for key in ("games", "stats"):
+        expected = _expected(key)
+        for cut in range(len(PAYLOAD) + 1):
+            chunks = [PAYLOAD[:cut], PAYLOAD[cut:]]
+            assert list(iter_array_items(iter_text(chunks), key)) == expected, (key, cut)
+
+
+def test_one_byte_chunks_match_json_loads():
+    chunks = [PAYLOAD[i:i + 1] for i in range(len(PAYLOAD))]
+    assert list(iter_array_items(iter_text(chunks), "games")) == _expected("games")
+
+
+def test_number_split_after_decimal_point():
+    assert list(iter_array_items(['{"games": [7, 8.', '5]}'], "games")) == [7, 8.5]
+    assert list(iter_array_items(['{"games": [1e', '3, 2]}'], "games")) == [1000.0, 2]
@@ -0,0 +1,140 @@
+"""Response views for the tool endpoints.
+
+Callers pick a `view` (`minimal`, `voice`, `full`) or an explicit `fields`
+list; endpoints then build only those fields per item. `full` is the default
+and matches the original response shape.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from profiling import traced
+
+View = Literal["minimal", "voice", "full"]
+
+ARTICLE_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "title": lambda a: a.title,
+    "description": lambda a: a.description,
+    "url": lambda a: a.url,
+    "source": lambda a: a.source,
+    "published_at": lambda a: a.published_at.isoformat(),
+    "url_to_image": lambda a: a.url_to_image,
+}
+
+VIDEO_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "video_id": lambda v: v.video_id,
+    "title": lambda v: v.title,
+    "url": lambda v: v.url,
+    "channel": lambda v: v.channel,
+    "view_count": lambda v: v.view_count,
+}
+
+GAME_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "game_pk": lambda g: g.game_pk,
+    "game_date": lambda g: g.game_date.isoformat(),
+    "home_team": lambda g: g.home_team,
+    "away_team": lambda g: g.away_team,
+    "is_home": lambda g: g.is_home,
+    "opponent": lambda g: g.opponent,
+    "venue": lambda g: g.venue,
+    "status": lambda g: g.status,
+    "home_score": lambda g: g.home_score,
+    "away_score": lambda g: g.away_score,
+    "result": lambda g: g.result,
+}
+
+# team_trends sections (keys of analytics.team_trends output)
+TREND_SECTIONS: Tuple[str, ...] = (
+    "record", "splits", "recent", "streak", "longest_streaks",
+    "rolling_win_pct", "run_diff_trend", "head_to_head",
+)
+
+VIEW_FIELDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "article": {
+        "minimal": ("title",),
+        "voice": ("title", "source", "published_at"),
+        "full": tuple(ARTICLE_FIELDS),
+    },
+    "video": {
+        "minimal": ("title",),
+        "voice": ("title", "channel", "view_count"),
+        "full": tuple(VIDEO_FIELDS),
+    },
+    "game": {
+        "minimal": ("game_date", "opponent", "is_home"),
+        "voice": ("game_date", "opponent", "is_home", "venue", "status", "home_score", "away_score", "result"),
+        "full": tuple(GAME_FIELDS),
+    },
+    "trends": {
+        "minimal": ("record", "streak"),
+        "voice": ("record", "splits", "recent", "streak", "head_to_head"),
+        "full": TREND_SECTIONS,
+    },
+}
+
+# Player stat keys per view; `full` returns the whole stat line
+STAT_VIEW_FIELDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "hitting": {
+        "minimal": ("avg", "homeRuns", "rbi", "ops"),
+        "voice": (
+            "gamesPlayed", "avg", "obp", "slg", "ops", "hits", "homeRuns", "rbi",
+            "runs", "stolenBases", "baseOnBalls", "strikeOuts",
+        ),
+    },
+    "pitching": {
+        "minimal": ("era", "wins", "losses", "strikeOuts"),
+        "voice": (
+            "gamesPlayed", "gamesStarted", "wins", "losses", "saves", "era", "whip",
+            "inningsPitched", "strikeOuts", "baseOnBalls", "avg",
+        ),
+    },
+}
+
+
+class ViewParams(BaseModel):
+    view: View = Field("full", description="Response detail: 'minimal', 'voice' or 'full'")
+    fields: Optional[List[str]] = Field(
+        None, description="Explicit per-item fields; overrides the view's field set"
+    )
+
+
+def select_fields(
+    kind: str,
+    params: ViewParams,
+    allowed: Iterable[str],
+    known: Optional[Iterable[str]] = None,
+) -> Tuple[str, ...]:
+    """Field names to build for `kind` items.
+
+    Explicit `fields` are validated against `known` (default `allowed`) and
+    then narrowed to `allowed`, so one list can serve several item kinds.
+    Raises ValueError on unknown names.
+    """
+    if params.fields is None:
+        return VIEW_FIELDS[kind][params.view]
+    allowed = tuple(allowed)
+    known = tuple(known) if known is not None else allowed
+    unknown = [f for f in params.fields if f not in known]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(known)}")
+    return tuple(f for f in dict.fromkeys(params.fields) if f in allowed)
+
+
+@traced
+def project(items: Iterable[Any], getters: Dict[str, Callable[[Any], Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Build one dict per item holding only `fields`."""
+    selected = [(f, getters[f]) for f in fields]
+    return [{f: get(item) for f, get in selected} for item in items]
+
+
+def project_stat(stat: Dict[str, Any], group: str, params: ViewParams) -> Dict[str, Any]:
+    """Subset of one player stat line; explicit `fields` are stat keys and missing ones are skipped."""
+    if params.fields is not None:
+        keys: Sequence[str] = params.fields
+    elif params.view == "full":
+        return dict(stat)
+    else:
+        keys = STAT_VIEW_FIELDS[group][params.view]
+    return {k: stat[k] for k in keys if k in stat}
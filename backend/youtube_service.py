@@ -2,29 +2,20 @@ from __future__ import annotations
 
 import logging
 import re
-from dataclasses import dataclass
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import requests
 
-try:
-    from youtube_transcript_api import (
-        YouTubeTranscriptApi,
-        TranscriptsDisabled,
-        NoTranscriptFound,
-        VideoUnavailable,
-    )
-except Exception:  # pragma: no cover
-    YouTubeTranscriptApi = None  # type: ignore
-    TranscriptsDisabled = NoTranscriptFound = VideoUnavailable = Exception  # type: ignore
-
-try:
-    from youtubesearchpython import VideosSearch  # fallback search without API key
-except Exception:  # pragma: no cover
-    VideosSearch = None
-
 from config import settings
+from news_service import get_team_search_terms
+from profiling import traced
+from ranking import rank_distinct
+from http_cache import get_json
+from shared_cache import get_shared_cache, make_key
 
 logger = logging.getLogger(__name__)
 
@@ -36,11 +27,56 @@ class VideoItem:
     url: str
     channel: Optional[str]
     view_count: Optional[int]
+    # ISO 8601 upload time when known
+    published_at: Optional[str] = None
 
 
 YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
 YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 
+YOUTUBE_SEARCH_TTL = 30 * 60
+# Candidates fetched per result slot, so re-uploads can be dropped without running short
+YOUTUBE_OVERFETCH = 3
+
+# Scraper fallback isolation: its own small pool, one cap on queued scrapes and
+# request threads waiting on them, and a short per-request wait budget.
+SCRAPER_MAX_WORKERS = 2
+SCRAPER_MAX_QUEUE = 8
+SCRAPER_WAIT = 5.0
+
+_scraper_pool: ThreadPoolExecutor | None = None
+_scraper_lock = threading.Lock()
+_scraper_slots = threading.BoundedSemaphore(SCRAPER_MAX_WORKERS + SCRAPER_MAX_QUEUE)
+_scraper_inflight: Dict[str, Future] = {}
+
+# Optional heavy dependencies, imported on first use (see _transcript_api / _videos_search)
+_transcript_mod = None
+_videos_search_cls = None
+
+
+def _transcript_api():
+    """Return the youtube_transcript_api module, or None if it is not installed."""
+    global _transcript_mod
+    if _transcript_mod is None:
+        try:
+            import youtube_transcript_api
+            _transcript_mod = youtube_transcript_api
+        except Exception:  # pragma: no cover
+            _transcript_mod = False
+    return _transcript_mod or None
+
+
+def _videos_search():
+    """Return youtubesearchpython.VideosSearch (fallback search without API key), or None."""
+    global _videos_search_cls
+    if _videos_search_cls is None:
+        try:
+            from youtubesearchpython import VideosSearch
+            _videos_search_cls = VideosSearch
+        except Exception:  # pragma: no cover
+            _videos_search_cls = False
+    return _videos_search_cls or None
+
 
 def _parse_view_count(text: str | None) -> Optional[int]:
     if not text:
@@ -65,107 +101,151 @@ def _parse_view_count(text: str | None) -> Optional[int]:
 session = requests.Session()
 
 
-def search_videos(query: str, max_results: int = 10, use_official_api: Optional[bool] = None) -> List[VideoItem]:
+@traced
+def search_videos(
+    query: str,
+    max_results: int = 10,
+    use_official_api: Optional[bool] = None,
+    team: Optional[str] = None,
+) -> List[VideoItem]:
     """
     Search YouTube for videos related to `query` and return up to `max_results` items.
     Uses official API if YOUTUBE_API_KEY is present, else scraper fallback.
+    Results are shared across workers; empty (degraded) results are not cached.
+    Candidates are over-fetched, re-uploads collapsed, and the rest ranked by
+    recency, views, channel and relevance to `team` (when given).
     """
     if use_official_api is None:
         use_official_api = bool(settings.youtube_api_key)
 
-    items: List[VideoItem] = []
-
+    fetch_n = min(50, max(25, max_results * YOUTUBE_OVERFETCH))
+    videos: Optional[List[VideoItem]] = None
     if use_official_api and settings.youtube_api_key:
-        params = {
-            "part": "snippet",
-            "type": "video",
-            "maxResults": 25,
-            # Prefer recent uploads
-            "order": "date",
-            "q": query,
+        key = make_key(_normalize_query(query), fetch_n, use_official_api)
+        try:
+            rows = get_shared_cache().get_or_load(
+                "youtube_search",
+                key,
+                YOUTUBE_SEARCH_TTL,
+                lambda: [asdict(v) for v in _search_official(query, fetch_n)],
+                store_if=bool,
+            )
+            videos = [VideoItem(**r) for r in rows]
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in (403, 429):
+                raise
+            logger.warning("YouTube Data API returned %s (quota?); using scraper fallback", status)
+    if videos is None:
+        # Outside get_or_load, so waiting on a scrape never holds a shared-cache lease
+        videos = _scrape_videos(query, fetch_n)
+    return rank_distinct(
+        videos,
+        title=lambda v: v.title,
+        body=lambda v: "",
+        published_at=lambda v: datetime.fromisoformat(v.published_at.replace("Z", "+00:00")) if v.published_at else None,
+        source=lambda v: v.channel,
+        terms=get_team_search_terms(team) if team else [],
+        limit=max_results,
+        popularity=lambda v: v.view_count,
+    )
+
+
+def _search_official(query: str, max_results: int) -> List[VideoItem]:
+    params = {
+        "part": "snippet",
+        "type": "video",
+        "maxResults": max_results,
+        # Prefer recent uploads
+        "order": "date",
+        "q": query,
+        "key": settings.youtube_api_key,
+    }
+    # Limit to last 30 days for freshness (day granularity keeps the request revalidatable)
+    published_after = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%dT00:00:00Z')
+    params["publishedAfter"] = published_after
+    data = get_json(session, YOUTUBE_SEARCH_URL, params=params, ttl=YOUTUBE_SEARCH_TTL)
+    video_ids = [
+        item.get("id", {}).get("videoId")
+        for item in data.get("items", [])
+        if item.get("id", {}).get("videoId")
+    ]
+    if not video_ids:
+        return []
+    # Fetch stats for reliable viewCount
+    stats_items: List[VideoItem] = []
+    for i in range(0, len(video_ids), 50):
+        chunk = video_ids[i : i + 50]
+        vparams = {
+            "part": "snippet,statistics",
+            "id": ",".join(chunk),
             "key": settings.youtube_api_key,
         }
-        # Limit to last 30 days for freshness
-        published_after = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ')
-        params["publishedAfter"] = published_after
-        resp = session.get(YOUTUBE_SEARCH_URL, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-        video_ids = [
-            item.get("id", {}).get("videoId")
-            for item in data.get("items", [])
-            if item.get("id", {}).get("videoId")
-        ]
-        if not video_ids:
-            return []
-        # Fetch stats for reliable viewCount
-        stats_items: List[VideoItem] = []
-        for i in range(0, len(video_ids), 50):
-            chunk = video_ids[i : i + 50]
-            vparams = {
-                "part": "snippet,statistics",
-                "id": ",".join(chunk),
-                "key": settings.youtube_api_key,
-            }
-            vresp = session.get(YOUTUBE_VIDEOS_URL, params=vparams, timeout=20)
-            vresp.raise_for_status()
-            vdata = vresp.json()
-            for it in vdata.get("items", []):
-                vid = it.get("id")
-                snippet = it.get("snippet", {})
-                stats = it.get("statistics", {})
-                view_count = int(stats.get("viewCount")) if stats.get("viewCount") else None
-                stats_items.append(
-                    VideoItem(
-                        video_id=vid,
-                        title=snippet.get("title", "(untitled)"),
-                        url=f"https://www.youtube.com/watch?v={vid}",
-                        channel=snippet.get("channelTitle"),
-                        view_count=view_count,
-                    )
+        vdata = get_json(session, YOUTUBE_VIDEOS_URL, params=vparams, ttl=YOUTUBE_SEARCH_TTL)
+        for it in vdata.get("items", []):
+            vid = it.get("id")
+            snippet = it.get("snippet", {})
+            stats = it.get("statistics", {})
+            view_count = int(stats.get("viewCount")) if stats.get("viewCount") else None
+            stats_items.append(
+                VideoItem(
+                    video_id=vid,
+                    title=snippet.get("title", "(untitled)"),
+                    url=f"https://www.youtube.com/watch?v={vid}",
+                    channel=snippet.get("channelTitle"),
+                    view_count=view_count,
+                    published_at=snippet.get("publishedAt"),
                 )
-        stats_items.sort(key=lambda x: (x.view_count or -1), reverse=True)
-        return stats_items[:max_results]
+            )
+    stats_items.sort(key=lambda x: (x.view_count or -1), reverse=True)
+    return stats_items[:max_results]
 
-    # Fallback scraper
-    if VideosSearch is None:
-        logger.warning("youtubesearchpython not installed; cannot fallback search")
-        return []
 
-    def _parse_published_time(t: Optional[str]) -> Optional[datetime]:
-        if not t or not isinstance(t, str):
+def _parse_published_time(t: Optional[str]) -> Optional[datetime]:
+    if not t or not isinstance(t, str):
+        return None
+    # Examples: "3 hours ago", "2 days ago", "5 months ago", "1 year ago"
+    try:
+        parts = t.strip().lower().split()
+        if len(parts) < 3 or parts[-1] != "ago":
             return None
-        # Examples: "3 hours ago", "2 days ago", "5 months ago", "1 year ago"
-        try:
-            parts = t.strip().lower().split()
-            if len(parts) < 3 or parts[-1] != "ago":
-                return None
-            num = int(parts[0])
-            unit = parts[1]
-            now = datetime.now(timezone.utc)
-            if unit.startswith("second"):
-                delta = timedelta(seconds=num)
-            elif unit.startswith("minute"):
-                delta = timedelta(minutes=num)
-            elif unit.startswith("hour"):
-                delta = timedelta(hours=num)
-            elif unit.startswith("day"):
-                delta = timedelta(days=num)
-            elif unit.startswith("week"):
-                delta = timedelta(weeks=num)
-            elif unit.startswith("month"):
-                # Approximate a month as 30 days
-                delta = timedelta(days=30 * num)
-            elif unit.startswith("year"):
-                delta = timedelta(days=365 * num)
-            else:
-                return None
-            return now - delta
-        except Exception:
+        num = int(parts[0])
+        unit = parts[1]
+        now = datetime.now(timezone.utc)
+        if unit.startswith("second"):
+            delta = timedelta(seconds=num)
+        elif unit.startswith("minute"):
+            delta = timedelta(minutes=num)
+        elif unit.startswith("hour"):
+            delta = timedelta(hours=num)
+        elif unit.startswith("day"):
+            delta = timedelta(days=num)
+        elif unit.startswith("week"):
+            delta = timedelta(weeks=num)
+        elif unit.startswith("month"):
+            # Approximate a month as 30 days
+            delta = timedelta(days=30 * num)
+        elif unit.startswith("year"):
+            delta = timedelta(days=365 * num)
+        else:
             return None
+        return now - delta
+    except Exception:
+        return None
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
 
+def _scrape_worker(query: str, limit: int) -> List[dict]:
+    """Run the blocking scrape and parsing on a scraper thread; results land in the shared cache."""
+    VideosSearch = _videos_search()
+    if VideosSearch is None:
+        logger.warning("youtubesearchpython not installed; cannot fallback search")
+        return []
     try:
-        vs = VideosSearch(query, limit=max(20, max_results))
+        vs = VideosSearch(query, limit=limit)
         res = vs.result() or {}
     except Exception as e:  # pragma: no cover
         logger.error("YouTube fallback search failed: %s", e)
@@ -181,22 +261,90 @@ def search_videos(query: str, max_results: int = 10, use_official_api: Optional[
         published_text = r.get("publishedTime") or r.get("publishedTimeText")
         pdt = _parse_published_time(published_text)
         if vid and url:
-            raw.append((VideoItem(video_id=vid, title=title, url=url, channel=channel, view_count=views), pdt, views))
+            item = VideoItem(
+                video_id=vid,
+                title=title,
+                url=url,
+                channel=channel,
+                view_count=views,
+                published_at=pdt.isoformat() if pdt else None,
+            )
+            raw.append((item, pdt, views))
     # Prefer newest first if we have published times, else fallback to view count
     if any(p is not None for _, p, _ in raw):
         raw.sort(key=lambda t: (t[1] or datetime.fromtimestamp(0, tz=timezone.utc)), reverse=True)
     else:
         raw.sort(key=lambda t: (t[2] or -1), reverse=True)
-    items = [t[0] for t in raw[:max_results]]
-    return items
+    rows = [asdict(t[0]) for t in raw]
+    if rows:
+        get_shared_cache().set("youtube_scrape", query, rows, YOUTUBE_SEARCH_TTL)
+    return rows
+
+
+def _scrape_videos(query: str, max_results: int) -> List[VideoItem]:
+    """Scraper fallback, isolated on its own bounded pool.
+
+    Results are cached per normalized query; any finished scrape counts as a hit,
+    since a scrape page holds fewer rows than most callers over-fetch. A request
+    waits up to SCRAPER_WAIT for the scrape of its query, holding a pool slot
+    while it does; a scrape that runs longer keeps going and fills the cache.
+    Only when the pool and its queue are full is an empty (degraded) result
+    returned without waiting.
+    """
+    global _scraper_pool
+    norm = _normalize_query(query)
+    cached = get_shared_cache().get("youtube_scrape", norm)
+    if cached is not None:
+        return [VideoItem(**r) for r in cached[:max_results]]
+
+    submitted = False
+    with _scraper_lock:
+        future = _scraper_inflight.get(norm)
+        if future is None:
+            if not _scraper_slots.acquire(blocking=False):
+                logger.warning("YouTube scraper pool saturated; returning no results for %r", query)
+                return []
+            if _scraper_pool is None:
+                _scraper_pool = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix="yt-scraper")
+            future = _scraper_pool.submit(_scrape_worker, norm, max(20, max_results))
+            _scraper_inflight[norm] = future
+            submitted = True
+
+    if submitted:
+        def _done(_f: Future, key: str = norm) -> None:
+            _scraper_slots.release()
+            with _scraper_lock:
+                _scraper_inflight.pop(key, None)
+
+        # Registered outside the lock: it runs inline if the scrape already finished
+        future.add_done_callback(_done)
+
+    waiting = not future.done()
+    if waiting and not _scraper_slots.acquire(blocking=False):
+        logger.warning("YouTube scraper pool saturated; returning no results for %r", query)
+        return []
+    try:
+        rows = future.result(timeout=SCRAPER_WAIT)
+    except FuturesTimeout:
+        logger.warning("YouTube scrape for %r exceeded %.1fs; returning no results", query, SCRAPER_WAIT)
+        return []
+    except Exception as e:  # pragma: no cover
+        logger.error("YouTube fallback search failed: %s", e)
+        return []
+    finally:
+        if waiting:
+            _scraper_slots.release()
+    return [VideoItem(**r) for r in rows[:max_results]]
 
 
 def fetch_transcript_text(video_id: str, prefer_langs: Optional[List[str]] = None) -> Optional[str]:
-    if YouTubeTranscriptApi is None:
+    yta = _transcript_api()
+    if yta is None:
         return None
+    NoTranscriptFound = yta.NoTranscriptFound
     prefer_langs = prefer_langs or ["en"]
     try:
-        transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcripts = yta.YouTubeTranscriptApi.list_transcripts(video_id)
         try:
             t = transcripts.find_transcript(prefer_langs)
             entries = t.fetch()
@@ -212,7 +360,7 @@ def fetch_transcript_text(video_id: str, prefer_langs: Optional[List[str]] = Non
         text = " ".join((e.get("text") or "").strip() for e in entries if e.get("text"))
         text = re.sub(r"\s+", " ", text).strip()
         return text or None
-    except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable):
+    except (yta.TranscriptsDisabled, yta.NoTranscriptFound, yta.VideoUnavailable):
         return None
     except Exception:
         logger.exception("Transcript fetch failed for %s", video_id)
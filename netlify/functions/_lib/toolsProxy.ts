@@ -9,8 +9,9 @@ export interface NetlifyEvent {
 
 const corsHeaders = {
   "Access-Control-Allow-Origin": "*",
-  "Access-Control-Allow-Headers": "Content-Type, Authorization, x-tool-token",
+  "Access-Control-Allow-Headers": "Content-Type, Authorization, x-tool-token, If-None-Match, x-profile",
   "Access-Control-Allow-Methods": "POST, OPTIONS",
+  "Access-Control-Expose-Headers": "ETag, x-profile-id, Retry-After, x-served-stale",
   "Cache-Control": "no-store",
 } as const;
 
@@ -39,25 +40,58 @@ export async function proxyTool(event: NetlifyEvent, operation: string) {
   try {
     const raw = event.body || "{}";
     const json = JSON.parse(raw);
+    // Allow `?view=voice` on the function URL for agents that cannot shape the body
+    const view = event.queryStringParameters?.view;
+    if (view && json.view === undefined) json.view = view;
 
     const headerToken = event.headers?.["x-tool-token"] || event.headers?.["X-Tool-Token"];
     const toolToken = json.tool_token || headerToken || process.env.TOOL_TOKEN;
+    const ifNoneMatch = event.headers?.["if-none-match"] || event.headers?.["If-None-Match"];
+    const profile = event.headers?.["x-profile"] || event.headers?.["X-Profile"];
+    // The backend rate-limits per token and caller; with the shared TOOL_TOKEN the client IP tells callers apart
+    const clientIp =
+      event.headers?.["x-nf-client-connection-ip"] ||
+      event.headers?.["client-ip"] ||
+      event.headers?.["x-forwarded-for"]?.split(",")[0].trim();
 
     const resp = await fetch(upstream, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
+        // fetch decodes the gzip body; the backend compresses responses over 500 bytes
+        "Accept-Encoding": "gzip",
         ...(toolToken ? { "x-tool-token": toolToken } : {}),
+        ...(ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {}),
+        ...(profile ? { "x-profile": profile } : {}),
+        ...(clientIp ? { "x-caller-id": `ip:${clientIp}` } : {}),
       },
       body: JSON.stringify(json),
     });
 
+    // Pass the backend's validators and freshness through instead of forcing no-store
+    const cacheHeaders: Record<string, string> = {};
+    const etag = resp.headers.get("etag");
+    const cacheControl = resp.headers.get("cache-control");
+    if (etag) cacheHeaders["ETag"] = etag;
+    if (cacheControl) cacheHeaders["Cache-Control"] = cacheControl;
+    const profileId = resp.headers.get("x-profile-id");
+    if (profileId) cacheHeaders["x-profile-id"] = profileId;
+    // Backoff hints for 429 and job 202 responses, and the marker on shed-but-served-stale answers
+    const retryAfter = resp.headers.get("retry-after");
+    if (retryAfter) cacheHeaders["Retry-After"] = retryAfter;
+    const servedStale = resp.headers.get("x-served-stale");
+    if (servedStale) cacheHeaders["x-served-stale"] = servedStale;
+
+    if (resp.status === 304) {
+      return { statusCode: 304, headers: { ...corsHeaders, ...cacheHeaders }, body: "" };
+    }
+
     const text = await resp.text();
     const contentType = resp.headers.get("content-type") || "application/json";
 
     return {
       statusCode: resp.status,
-      headers: { ...corsHeaders, "Content-Type": contentType },
+      headers: { ...corsHeaders, ...cacheHeaders, "Content-Type": contentType },
       body: text,
     };
   } catch (err) {
@@ -0,0 +1,5 @@
+import { proxyTool, NetlifyEvent } from "./_lib/toolsProxy";
+
+export async function handler(event: NetlifyEvent) {
+  return proxyTool(event, "jobs/submit");
+}